@@ -16,7 +16,77 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import asyncio
+import os
+import time
 from playwright.async_api import async_playwright  
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.driver.lean import LEAN_ARGS, LEAN_VIEWPORT, apply_lean_context
+
+try:
+    import fcntl  # Bloqueo de archivos (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class ProfileLocked(RuntimeError):
+    """
+    El perfil persistente siguió bloqueado por otro proceso durante todo el tiempo de espera.
+    """
+
+
+class ProfileLock:
+    """
+    Bloqueo exclusivo sobre un directorio de perfil persistente.
+
+    Chromium corrompe el perfil (cookies, caché) si dos procesos lo abren a la vez,
+    así que cada worker debe esperar a que el anterior lo libere.
+    """
+
+    def __init__(self, user_data_dir, timeout=None):
+        """
+        Parámetros:
+        - user_data_dir (str): carpeta del perfil.
+        - timeout (float): segundos máximos de espera (None = esperar indefinidamente).
+        """
+        self.path = os.path.join(user_data_dir, ".digibook.lock")
+        self.timeout = timeout
+        self._file = None
+
+
+    async def acquire(self):
+        self._file = open(self.path, "a+")
+        if fcntl is None:
+            return
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        waiting = False
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._file.seek(0)
+                self._file.truncate()
+                self._file.write(str(os.getpid()))
+                self._file.flush()
+                return
+            except BlockingIOError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    raise ProfileLocked(
+                        f"Browser profile is locked by another process: {self.path}"
+                    )
+                if not waiting:
+                    waiting = True
+                    logger.log(f"[PROFILE] Profile locked by another process, waiting: {self.path}")
+                await asyncio.sleep(0.5)
+
+
+    def release(self):
+        if self._file:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
 
 
 class BrowserManager:
@@ -28,13 +98,18 @@ class BrowserManager:
     sin importar si ocurre un error durante la ejecución.
     """
 
-    def __init__(self, headless):
+    def __init__(self, headless, user_data_dir=None, cache_size_mb=512, lean=False, profile_lock_timeout=None):
         # Guardamos los objetos principales que controlan el navegador.
         # Al inicio están en None, y se inicializan en __aenter__.
         self.playwright = None  # Instancia principal de Playwright (controla los navegadores instalados).
         self.browser = None     # Objeto navegador (cuando se lanza sin perfil persistente).
         self.context = None     # Contexto de navegación (como un perfil temporal o persistente).
         self.headless = headless # Booleano que indica si el navegador se ejecuta en modo headless (sin interfaz gráfica)
+        self.user_data_dir = user_data_dir # Carpeta del perfil persistente (None = contexto efímero)
+        self.cache_size_mb = cache_size_mb # Límite de la caché HTTP en disco del perfil persistente
+        self.lock = None        # ProfileLock sobre user_data_dir
+        self.profile_lock_timeout = profile_lock_timeout # Espera máxima por el perfil (None = indefinida)
+        self.lean = lean        # Modo ligero: viewport pequeño, sin animaciones ni reproductor (ver lean.py)
 
 
     async def __aenter__(self):
@@ -46,13 +121,40 @@ class BrowserManager:
         # Iniciamos Playwright (arranca los "drivers" que permiten controlar navegadores).
         self.playwright = await async_playwright().start()
 
-        # Lanzamos Chromium en modo headless o visible según la configuración
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless
-        )
-
-        # Creamos un "contexto nuevo" sobre ese navegador (cada contexto es como una ventana aislada).
-        self.context = await self.browser.new_context()
+        # Opciones del modo ligero (se aplican igual al contexto efímero y al persistente)
+        args = list(LEAN_ARGS) if self.lean else []
+        context_options = {"viewport": LEAN_VIEWPORT, "reduced_motion": "reduce"} if self.lean else {}
+
+        if self.user_data_dir:
+            # Perfil persistente: la caché HTTP (JS, CSS, assets del reproductor)
+            # sobrevive entre ejecuciones. Se bloquea para evitar que otro worker lo use a la vez.
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            self.lock = ProfileLock(self.user_data_dir, timeout=self.profile_lock_timeout)
+            try:
+                await self.lock.acquire()
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    self.user_data_dir,
+                    headless=self.headless,
+                    args=args + [f"--disk-cache-size={int(self.cache_size_mb * 1024 * 1024)}"],
+                    **context_options
+                )
+            except Exception:
+                # __aexit__ no se ejecuta si __aenter__ falla: liberamos aquí.
+                self.lock.release()
+                await self.playwright.stop()
+                raise
+        else:
+            # Lanzamos Chromium en modo headless o visible según la configuración
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=args
+            )
+
+            # Creamos un "contexto nuevo" sobre ese navegador (cada contexto es como una ventana aislada).
+            self.context = await self.browser.new_context(**context_options)
+
+        if self.lean:
+            await apply_lean_context(self.context)
 
         # Retornamos el contexto de navegación para que pueda usarse dentro del `async with`.
         return self.context
@@ -75,3 +177,24 @@ class BrowserManager:
         # Finalmente detenemos Playwright, liberando los recursos del sistema.
         if self.playwright:
             await self.playwright.stop()
+
+        # Liberamos el perfil persistente para el siguiente worker.
+        if self.lock:
+            self.lock.release()
+
+
+    async def prewarm(self, urls, traffic=None):
+        """
+        Visita las URLs indicadas para llenar la caché HTTP del perfil
+        (bundles de JS, CSS y assets del reproductor) antes del scraping.
+        """
+        for url in urls:
+            page = await self.context.new_page()
+            try:
+                stats = await traffic.attach(self.context, page) if traffic else None
+                await page.goto(url, wait_until="load")
+                logger.log(f"[PREWARM] Loaded {url}" + (f" {stats.summary()}" if stats else ""))
+            except Exception as error:
+                logger.log(f"[PREWARM] [WARNING] Could not load {url}: {error}", "warning")
+            finally:
+                await page.close()
@@ -0,0 +1,74 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import os
+from DigiMonitor.app.src.scheduler.retry import PermanentError
+from DigiMonitor.app.src.utils.urls import video_id_from_url
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class HarArchive:
+    """
+    Grabación y reproducción del tráfico de red por URL (archivos HAR comprimidos).
+
+    - record: cada página registra su tráfico en `<clave>.zip` (video: su ID; canal o
+      listado: hash de la URL). Playwright escribe los archivos al cerrar el contexto.
+    - replay: las páginas se sirven solo desde el HAR con `route_from_har`; lo que no
+      esté grabado se aborta, así no sale ninguna petición a la red. Permite volver a
+      correr la extracción sobre cientos de páginas en segundos y sirve de corpus
+      determinista para benchmarks.
+    """
+
+    def __init__(self, folder, mode):
+        """
+        Parámetros:
+        - folder (str): carpeta de los archivos HAR.
+        - mode (str): "record" o "replay".
+        """
+        self.folder = folder
+        self.mode = mode
+        self.pages = 0
+        os.makedirs(folder, exist_ok=True)
+
+
+    @staticmethod
+    def key(url) -> str:
+        return video_id_from_url(url) or hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+    def path(self, url) -> str:
+        return os.path.join(self.folder, f"{self.key(url)}.zip")
+
+
+    async def attach(self, page, url):
+        """
+        Enruta la página a través del HAR de `url` (grabando o reproduciendo).
+        En replay, una URL sin grabación es un fallo permanente (no se reintenta).
+        """
+        path = self.path(url)
+        if self.mode == RECORD:
+            await page.route_from_har(path, update=True, update_content="embed", update_mode="minimal")
+        else:
+            if not os.path.exists(path):
+                raise PermanentError(f"No HAR recording for {url} in {self.folder}")
+            await page.route_from_har(path, not_found="abort")
+        self.pages += 1
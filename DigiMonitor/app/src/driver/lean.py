@@ -0,0 +1,115 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Modo de renderizado ligero (`--lean`): menos CPU por pestaña mientras se hace
+scroll de comentarios, para poder abrir más pestañas por núcleo.
+"""
+
+
+from DigiMonitor.app.src.utils import logger
+
+
+# Viewport pequeño: menos píxeles que pintar y componer por frame
+LEAN_VIEWPORT = {"width": 800, "height": 600}
+
+# Flags de Chromium: sin scroll suave, sin reproducción automática, sin audio
+LEAN_ARGS = [
+    "--disable-smooth-scrolling",
+    "--autoplay-policy=user-gesture-required",
+    "--mute-audio",
+]
+
+# Peticiones de video/audio del reproductor: nunca se necesitan para extraer datos.
+# Se bloquean por CDP (Network.setBlockedURLs) y no con `context.route`: activar el
+# enrutado de Playwright desactiva la caché HTTP y anularía `--user-data-dir`.
+LEAN_BLOCKED_URLS = ["*videoplayback*"]
+
+# Se inyecta en cada documento antes de sus scripts:
+# - estilos que desactivan animaciones, transiciones y scroll suave, y ocultan
+#   la barra lateral de recomendaciones y el reproductor;
+# - pausa inmediata de cualquier <video> que intente reproducirse.
+LEAN_INIT_SCRIPT = """
+(() => {
+    const css = `
+        *, *::before, *::after {
+            animation: none !important;
+            transition: none !important;
+            scroll-behavior: auto !important;
+        }
+        #secondary, #related, ytd-watch-next-secondary-results-renderer,
+        #movie_player video, .ytp-chrome-bottom, ytd-live-chat-frame {
+            display: none !important;
+        }
+    `;
+    const inject = () => {
+        const style = document.createElement('style');
+        style.id = 'digibook-lean';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) inject();
+    else document.addEventListener('DOMContentLoaded', inject, { once: true });
+    document.addEventListener('play', (event) => event.target.pause && event.target.pause(), true);
+})();
+"""
+
+# Se ejecuta en la página ya cargada: pausa el reproductor y elimina del DOM
+# la barra lateral (ocultarla no basta: sus elementos siguen actualizándose).
+LEAN_PAGE_SCRIPT = """
+() => {
+    document.querySelectorAll('video').forEach(v => { v.pause(); v.removeAttribute('src'); v.load(); });
+    const player = document.querySelector('#movie_player');
+    if (player && player.stopVideo) player.stopVideo();
+    document.querySelectorAll('#secondary #related, ytd-watch-next-secondary-results-renderer').forEach(n => n.remove());
+}
+"""
+
+
+async def apply_lean_context(context):
+    """
+    Configura un contexto ya creado: script de inicio y bloqueo de medios en
+    cada página (las ya abiertas y las que se abran después).
+    """
+    await context.add_init_script(LEAN_INIT_SCRIPT)
+
+    async def on_page(page):
+        await block_media(context, page)
+
+    context.on("page", on_page)
+    for page in context.pages:
+        await block_media(context, page)
+
+
+async def block_media(context, page):
+    """
+    Bloquea las peticiones de video/audio de `page` mediante una sesión CDP propia.
+    """
+    try:
+        session = await context.new_cdp_session(page)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    except Exception as error:
+        logger.log(f"[WARNING] Media blocking unavailable: {error}", "warning")
+
+
+async def strip_page(page):
+    """
+    Pausa el reproductor y elimina la barra lateral de una página de video.
+    """
+    await page.evaluate(LEAN_PAGE_SCRIPT)
@@ -0,0 +1,120 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from DigiMonitor.app.src.utils import logger
+
+
+class PageTraffic:
+    """
+    Contadores de tráfico de una página: bytes servidos desde la caché
+    del navegador frente a bytes descargados de la red.
+    """
+
+    def __init__(self):
+        self.network_bytes = 0
+        self.cached_bytes = 0
+        self.network_requests = 0
+        self.cached_requests = 0
+        self._cached_ids = set()
+
+
+    def add(self, other):
+        self.network_bytes += other.network_bytes
+        self.cached_bytes += other.cached_bytes
+        self.network_requests += other.network_requests
+        self.cached_requests += other.cached_requests
+
+
+    def as_dict(self) -> dict:
+        return {
+            "network_bytes": self.network_bytes,
+            "cached_bytes": self.cached_bytes,
+            "network_requests": self.network_requests,
+            "cached_requests": self.cached_requests,
+        }
+
+
+    def summary(self) -> str:
+        return (f"network={self.network_bytes / 1024:.0f} KiB ({self.network_requests} req), "
+                f"cached={self.cached_bytes / 1024:.0f} KiB ({self.cached_requests} req)")
+
+
+    # Eventos CDP (Chrome DevTools Protocol)
+    def _on_response(self, params):
+        response = params.get("response", {})
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            self._cached_ids.add(params.get("requestId"))
+
+
+    def _on_served_from_cache(self, params):
+        self._cached_ids.add(params.get("requestId"))
+
+
+    def _on_data(self, params):
+        if params.get("requestId") in self._cached_ids:
+            self.cached_bytes += params.get("dataLength", 0)
+
+
+    def _on_finished(self, params):
+        request_id = params.get("requestId")
+        if request_id in self._cached_ids:
+            self._cached_ids.discard(request_id)
+            self.cached_requests += 1
+        else:
+            self.network_bytes += int(params.get("encodedDataLength", 0))
+            self.network_requests += 1
+
+
+class TrafficStats:
+    """
+    Mide, mediante una sesión CDP por página, cuántos bytes se sirvieron desde la
+    caché HTTP y cuántos desde la red. Solo funciona con Chromium.
+
+    Se usa para cuantificar el ahorro del perfil persistente (`--user-data-dir`).
+    """
+
+    def __init__(self):
+        self.total = PageTraffic()
+        self.pages = 0
+
+
+    async def attach(self, context, page) -> PageTraffic | None:
+        """
+        Empieza a contar el tráfico de `page`. Debe llamarse antes de `page.goto`.
+        """
+        stats = PageTraffic()
+        try:
+            session = await context.new_cdp_session(page)
+            session.on("Network.responseReceived", stats._on_response)
+            session.on("Network.requestServedFromCache", stats._on_served_from_cache)
+            session.on("Network.dataReceived", stats._on_data)
+            session.on("Network.loadingFinished", stats._on_finished)
+            await session.send("Network.enable")
+        except Exception as error:
+            logger.log(f"[WARNING] Traffic stats unavailable: {error}", "warning")
+            return None
+        return stats
+
+
+    def collect(self, stats):
+        """
+        Suma los contadores de una página terminada al total de la ejecución.
+        """
+        if stats is not None:
+            self.total.add(stats)
+            self.pages += 1
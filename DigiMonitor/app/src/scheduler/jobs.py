@@ -0,0 +1,161 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from DigiMonitor.app.src.scheduler.retry import PERMANENT, RetryPolicy
+
+
+class Job:
+    """
+    Una URL a procesar y su historial de intentos.
+    """
+
+    def __init__(self, url, index, save=True, owner=None):
+        self.url = url
+        self.index = index        # Índice (base 0) usado en logs y nombres de archivo
+        self.save = save          # False → los datos se devuelven en el resultado (daemon "stream")
+        self.owner = owner        # Trabajo del daemon al que pertenece (o None)
+        self.attempts = 0
+        self.history = []         # [{"attempt", "failure", "error"}]
+
+
+class JobScheduler:
+    """
+    Cola de trabajos con dos carriles:
+
+    - fresh: URLs nuevas, siempre tienen prioridad.
+    - retry: URLs fallidas con clase transient/throttled, listas tras un backoff
+             con jitter. Solo `retry_slots` workers pueden estar en este carril a la vez,
+             así los reintentos nunca acaparan todas las pestañas.
+
+    Los workers llaman `next()` hasta recibir None (cola cerrada y sin pendientes)
+    y `done(job, result)` al terminar cada intento.
+
+    Con `keep_failures=False` (daemon) los fallos definitivos solo se cuentan:
+    el informe con el historial de cada URL solo se usa en el CLI.
+    """
+
+    def __init__(self, max_concurrent, policy=None, retry_slots=None, keep_failures=True):
+        self.policy = policy or RetryPolicy()
+        self.retry_slots = retry_slots or max(1, max_concurrent // 2)
+        self.fresh = deque()
+        self.retry = []               # heap (ready_at, seq, job)
+        self.active_retries = 0
+        self.pending = 0              # Trabajos sin resultado final
+        self.closed = False
+        self.keep_failures = keep_failures
+        self.failures = []            # Resultados finales con status "error" (si keep_failures)
+        self.failed_by_class = {}     # Fallos definitivos por clase
+        self.completed = 0
+        self._seq = itertools.count()
+        self._changed = asyncio.Condition()
+
+
+    def depth(self) -> dict:
+        return {"fresh": len(self.fresh), "retry": len(self.retry)}
+
+
+    async def submit(self, job):
+        async with self._changed:
+            self.fresh.append(job)
+            self.pending += 1
+            self._changed.notify_all()
+
+
+    async def close(self):
+        """
+        Indica que no llegarán más URLs nuevas: los workers terminan al vaciarse la cola.
+        """
+        async with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+
+    def _pop_ready(self):
+        if self.fresh:
+            return self.fresh.popleft(), False
+        if self.retry and self.retry[0][0] <= time.monotonic() and self.active_retries < self.retry_slots:
+            self.active_retries += 1
+            return heapq.heappop(self.retry)[2], True
+        return None, False
+
+
+    async def next(self):
+        """
+        Devuelve (job, is_retry) o (None, False) cuando ya no hay trabajo.
+        """
+        async with self._changed:
+            while True:
+                job, is_retry = self._pop_ready()
+                if job is not None:
+                    job.attempts += 1
+                    return job, is_retry
+                if self.closed and self.pending == 0:
+                    return None, False
+                timeout = None
+                if self.retry and self.active_retries < self.retry_slots:
+                    timeout = max(0.0, self.retry[0][0] - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+
+    async def done(self, job, is_retry, result) -> bool:
+        """
+        Registra el resultado de un intento. Devuelve True si el trabajo terminó
+        (éxito o fallo definitivo) y False si se volvió a encolar.
+        """
+        async with self._changed:
+            if is_retry:
+                self.active_retries -= 1
+
+            if result["status"] != "ok":
+                failure = result.get("failure") or PERMANENT
+                job.history.append({"attempt": job.attempts, "failure": failure, "error": result.get("error")})
+                if self.policy.should_retry(failure, job.attempts):
+                    ready_at = time.monotonic() + self.policy.delay(failure, job.attempts)
+                    heapq.heappush(self.retry, (ready_at, next(self._seq), job))
+                    self._changed.notify_all()
+                    return False
+                self.failed_by_class[failure] = self.failed_by_class.get(failure, 0) + 1
+                if self.keep_failures:
+                    self.failures.append({**result, "attempts": job.attempts, "history": job.history})
+            else:
+                self.completed += 1
+
+            result["attempts"] = job.attempts
+            self.pending -= 1
+            self._changed.notify_all()
+            return True
+
+
+    def failure_report(self) -> dict:
+        """
+        Informe final: URLs perdidas tras agotar reintentos, agrupadas por clase.
+        """
+        return {
+            "completed": self.completed,
+            "failed": sum(self.failed_by_class.values()),
+            "failed_by_class": dict(self.failed_by_class),
+            "failures": self.failures,
+        }
@@ -0,0 +1,115 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import heapq
+import json
+import os
+import statistics
+from DigiMonitor.app.src.utils.urls import video_id_from_url
+
+
+HISTORY_FILE = "scrape_history.json"
+
+# Modelo de costo cuando no hay duración previa: arranque de la página + scroll por comentario
+BASE_SECONDS = 25.0
+SECONDS_PER_COMMENT = 0.06
+
+
+class ScrapeHistory:
+    """
+    Historial compacto de ejecuciones anteriores por video:
+    {video_id: {"comments": post_comments_count, "seconds": duración del último scraping}}.
+
+    Se guarda en `output_dir/scrape_history.json` y se actualiza al final de cada ejecución,
+    así estimar no requiere abrir los JSON de salida.
+    """
+
+    def __init__(self, folder):
+        self.path = os.path.join(folder, HISTORY_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+
+    def key(self, url):
+        return video_id_from_url(url) or url
+
+
+    def record(self, url, comments, seconds):
+        entry = self.entries.setdefault(self.key(url), {})
+        if comments is not None:
+            entry["comments"] = comments
+        if seconds is not None:
+            entry["seconds"] = round(seconds, 2)
+
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+
+    def estimate(self, url) -> float | None:
+        """
+        Segundos esperados para la URL: duración medida si existe, si no el modelo
+        por número de comentarios. None si la URL es desconocida.
+        """
+        entry = self.entries.get(self.key(url))
+        if not entry:
+            return None
+        if entry.get("seconds"):
+            return entry["seconds"]
+        if entry.get("comments") is not None:
+            return BASE_SECONDS + entry["comments"] * SECONDS_PER_COMMENT
+        return None
+
+
+def estimate_all(urls, history) -> list[float]:
+    """
+    Estima cada URL; las desconocidas reciben la mediana de las conocidas
+    (o solo el costo base si no hay historial).
+    """
+    known = [history.estimate(url) for url in urls]
+    fallback = statistics.median([e for e in known if e is not None] or [BASE_SECONDS])
+    return [e if e is not None else fallback for e in known]
+
+
+def longest_first(items, estimates):
+    """
+    Orden LPT (Longest Processing Time first): los trabajos más largos empiezan primero.
+    Con workers que toman el siguiente trabajo al quedar libres, esto es el
+    algoritmo de list scheduling LPT (makespan ≤ 4/3 del óptimo).
+    """
+    order = sorted(range(len(items)), key=lambda i: estimates[i], reverse=True)
+    return [items[i] for i in order], [estimates[i] for i in order]
+
+
+def simulate_makespan(durations, slots) -> float:
+    """
+    Makespan si `slots` pestañas toman los trabajos en el orden dado
+    (cada trabajo va a la primera pestaña que queda libre).
+    """
+    loads = [0.0] * max(1, slots)
+    for duration in durations:
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
@@ -0,0 +1,164 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import time
+from collections import deque
+from DigiMonitor.app.src.utils import logger
+
+
+class TokenBucket:
+    """
+    Token bucket asíncrono: permite `rate` operaciones por segundo con ráfagas de hasta `burst`.
+    Los que esperan se atienden en orden (un solo lock), así ninguna pestaña se queda sin turno.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+    def set_rate(self, rate):
+        self._refill()
+        self.rate = rate
+
+
+    async def acquire(self):
+        if self.rate <= 0:  # Sin límite
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PacingScheduler:
+    """
+    Ritmo global de peticiones compartido por todos los workers de `_process_url`.
+
+    - navigate(): una navegación (page.goto) por token.
+    - scroll():   una iteración de scroll que dispara cargas de comentarios por token.
+
+    Control AIMD: cada señal de throttling (sección #below vacía, 429/consentimiento,
+    varios timeouts seguidos o comentarios ausentes en varias URLs distintas) multiplica
+    el ritmo por `decrease`; cada URL exitosa lo recupera sumando `increase` hasta el
+    ritmo configurado.
+    """
+
+    def __init__(self, nav_rate=1.0, scroll_rate=5.0, burst=1, decrease=0.5, increase=0.05,
+                 min_factor=0.05, cooldown=10.0, timeout_threshold=3, timeout_window=60.0):
+        self.nav_rate = nav_rate
+        self.scroll_rate = scroll_rate
+        self.navigations = TokenBucket(nav_rate, burst)
+        self.scrolls = TokenBucket(scroll_rate, burst)
+        self.factor = 1.0
+        self.decrease = decrease
+        self.increase = increase
+        self.min_factor = min_factor
+        self.cooldown = cooldown                    # Segundos mínimos entre dos reducciones
+        self.timeout_threshold = timeout_threshold  # Timeouts dentro de la ventana que cuentan como throttling
+        self.timeout_window = timeout_window
+        self.throttle_events = 0
+        self._last_decrease = 0.0
+        self._timeouts = deque()
+        self._missing_comments = deque()            # (instante, url) con sección de comentarios sin cabecera
+
+
+    async def navigate(self):
+        await self.navigations.acquire()
+
+
+    async def scroll(self):
+        await self.scrolls.acquire()
+
+
+    def _apply(self):
+        self.navigations.set_rate(self.nav_rate * self.factor)
+        self.scrolls.set_rate(self.scroll_rate * self.factor)
+
+
+    def report_throttle(self, reason):
+        """
+        Señal de throttling: reduce el ritmo (como máximo una vez por `cooldown`,
+        para que varias pestañas afectadas por el mismo episodio no lo colapsen).
+        """
+        self.throttle_events += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.factor = max(self.min_factor, self.factor * self.decrease)
+        self._apply()
+        logger.log(f"[PACING] Throttling detected ({reason}). Rate factor lowered to {self.factor:.2f} "
+                   f"({self.nav_rate * self.factor:.2f} nav/s, {self.scroll_rate * self.factor:.2f} scroll/s)", "warning")
+
+
+    def report_timeout(self):
+        """
+        Un timeout aislado es transitorio; varios dentro de la ventana indican throttling.
+        """
+        now = time.monotonic()
+        self._timeouts.append(now)
+        while self._timeouts and now - self._timeouts[0] > self.timeout_window:
+            self._timeouts.popleft()
+        if len(self._timeouts) >= self.timeout_threshold:
+            self._timeouts.clear()
+            self.report_throttle(f"{self.timeout_threshold} timeouts in {self.timeout_window:.0f}s")
+
+
+    def report_missing_comments(self, url):
+        """
+        Comentarios sin cabecera en una URL: por sí solo es ambiguo (transmisiones y
+        estrenos tienen ese DOM); solo cuenta como throttling si se repite en
+        `timeout_threshold` URLs distintas dentro de la ventana.
+        """
+        now = time.monotonic()
+        self._missing_comments.append((now, url))
+        while self._missing_comments and now - self._missing_comments[0][0] > self.timeout_window:
+            self._missing_comments.popleft()
+        if len({u for _, u in self._missing_comments}) >= self.timeout_threshold:
+            self._missing_comments.clear()
+            self.report_throttle(f"missing comments section on {self.timeout_threshold} URLs "
+                                 f"in {self.timeout_window:.0f}s")
+
+
+    def report_success(self):
+        if self.factor < 1.0:
+            self.factor = min(1.0, self.factor + self.increase)
+            self._apply()
+
+
+    def status(self) -> dict:
+        return {
+            "factor": round(self.factor, 3),
+            "nav_rate": round(self.nav_rate * self.factor, 3),
+            "scroll_rate": round(self.scroll_rate * self.factor, 3),
+            "throttle_events": self.throttle_events,
+        }
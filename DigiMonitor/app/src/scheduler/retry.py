@@ -0,0 +1,121 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import random
+from urllib.parse import urlparse
+
+
+# Clases de fallo
+TRANSIENT = "transient"   # Timeout, red, renderer caído → se reintenta con backoff
+THROTTLED = "throttled"   # 429, muro de consentimiento, /sorry → se reintenta con backoff largo
+PERMANENT = "permanent"   # URL inválida, 404, error de programa → no se reintenta
+
+
+class ThrottledError(Exception):
+    """
+    El sitio está limitando las peticiones (429, consentimiento, captcha).
+    """
+
+
+class PermanentError(Exception):
+    """
+    Fallo que no se resuelve reintentando (URL inválida, video inexistente).
+    """
+
+
+def check_response(response, final_url):
+    """
+    Revisa la respuesta de `page.goto` y lanza ThrottledError / PermanentError
+    cuando el estado HTTP o la redirección final lo indican.
+    """
+    host = urlparse(final_url or "").netloc
+    if host.startswith("consent.") or "/sorry/" in (final_url or ""):
+        raise ThrottledError(f"Redirected to {final_url}")
+    if response is None:
+        return
+    if response.status == 429:
+        raise ThrottledError(f"HTTP 429 for {response.url}")
+    if response.status in (400, 404, 410):
+        raise PermanentError(f"HTTP {response.status} for {response.url}")
+    if response.status >= 500:
+        raise ConnectionError(f"HTTP {response.status} for {response.url}")
+
+
+def classify_failure(error) -> str:
+    """
+    Clasifica una excepción de `_process_url` como transient, throttled o permanent.
+    """
+    if isinstance(error, ThrottledError):
+        return THROTTLED
+    if isinstance(error, PermanentError):
+        return PERMANENT
+
+    message = str(error)
+    if any(code in message for code in ("ERR_NAME_NOT_RESOLVED", "ERR_INVALID_URL", "invalid URL")):
+        return PERMANENT
+    if "ERR_TOO_MANY_REQUESTS" in message:
+        return THROTTLED
+
+    # Timeouts (asyncio y Playwright), errores de red y del navegador: vale la pena reintentar
+    if type(error).__name__ == "TimeoutError" or isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if type(error).__module__.startswith("playwright"):
+        return TRANSIENT
+
+    # Cualquier otra excepción es un error de programa: reintentar no ayuda
+    return PERMANENT
+
+
+class RetryPolicy:
+    """
+    Backoff exponencial con jitter completo ("full jitter"):
+    delay = uniform(0, min(max_delay, base_delay * 2 ** attempt)).
+
+    Los fallos por throttling usan una base `throttle_factor` veces mayor.
+    """
+
+    def __init__(self, max_retries=3, base_delay=5.0, max_delay=300.0, throttle_factor=4.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttle_factor = throttle_factor
+
+
+    def should_retry(self, failure, attempts) -> bool:
+        return failure != PERMANENT and attempts <= self.max_retries
+
+
+    def delay(self, failure, attempts) -> float:
+        base = self.base_delay * (self.throttle_factor if failure == THROTTLED else 1)
+        return random.uniform(0, min(self.max_delay, base * 2 ** (attempts - 1)))
+
+
+class PhaseTimeouts:
+    """
+    Tiempo máximo (segundos) de cada fase de `_process_url`.
+    Un valor None deja el límite por defecto de Playwright.
+    """
+
+    def __init__(self, navigate=30.0, ready=20.0):
+        self.navigate = navigate  # page.goto
+        self.ready = ready        # wait_for_selector de la sección #below
+
+
+    def ms(self, phase):
+        seconds = getattr(self, phase)
+        return seconds * 1000 if seconds is not None else None
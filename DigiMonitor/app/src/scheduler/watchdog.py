@@ -0,0 +1,237 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import contextvars
+import time
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.scheduler.retry import PermanentError
+
+
+# Límite por defecto (segundos de reloj) de cada fase; None = sin límite de reloj
+PHASE_DEADLINES = {
+    "navigate": 120,
+    "ready": 120,
+    "sort": 60,
+    "scroll": None,
+    "extract": None,
+    "replies": None,
+    "metadata": 120,
+    "channel": 180,
+}
+
+# Fases cuya duración crece con el tamaño del video: se vigilan por falta de progreso
+# (`stall_deadline`) en lugar de por tiempo total
+PROGRESS_PHASES = ("scroll", "extract", "replies")
+
+_current_tracker = contextvars.ContextVar("digibook_watchdog_tracker", default=None)
+
+
+def report_progress():
+    """
+    Marca progreso en la página vigilada de la tarea actual (no hace nada fuera del watchdog).
+    """
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.last_progress = time.monotonic()
+
+
+class WatchdogTimeout(TimeoutError):
+    """
+    El watchdog cerró la página porque una fase se colgó o el renderer se cayó.
+    Es un TimeoutError: se clasifica como transient y se reintenta.
+    """
+
+
+class WatchdogDeadline(PermanentError):
+    """
+    La URL superó su límite total (`url_deadline`): reintentarla desde cero
+    volvería a superarlo, así que no se reintenta.
+    """
+
+
+class PhaseTracker:
+    """
+    Estado de una página vigilada: fase actual y cuándo empezaron la URL y la fase.
+    """
+
+    def __init__(self, label, page, task):
+        self.label = label
+        self.page = page
+        self.task = task
+        self.started = time.monotonic()
+        self.phase = "open"
+        self.phase_started = self.started
+        self.last_progress = self.started
+        self.crashed = False
+        self.permanent = False  # True si se superó el límite total de la URL
+        self.hung = None      # Fase en la que se colgó (None = sin intervención)
+        self.reason = None
+
+
+    def enter(self, phase):
+        self.phase = phase
+        self.phase_started = self.last_progress = time.monotonic()
+
+
+    def error(self) -> Exception:
+        return (WatchdogDeadline if self.permanent else WatchdogTimeout)(f"Watchdog: {self.reason}")
+
+
+class Watchdog:
+    """
+    Vigilancia de las páginas del scraper para liberar las que se cuelgan.
+
+    Una página colgada (goto o wait_for_selector sin respuesta, scroll que no avanza,
+    renderer caído) retendría su lugar en el semáforo para siempre. Cada segundo
+    el watchdog revisa las páginas activas:
+    - fases cortas (navegación, espera, metadatos): límite de reloj por fase;
+    - scroll, extracción y respuestas: sin límite de reloj, pero la página se da por
+      colgada si pasan `stall_deadline` segundos sin `report_progress()`; un video
+      enorme que sigue avanzando nunca se interrumpe;
+    - límite total por URL opcional (`url_deadline`, desactivado por defecto).
+    A las páginas colgadas les cancela la tarea (el trabajo termina con WatchdogTimeout
+    y libera el semáforo) y les cierra la página en segundo plano. Cuenta estas
+    páginas "zombi" por fase.
+    """
+
+    def __init__(self, url_deadline=None, phase_deadlines=None, stall_deadline=300, interval=1.0):
+        """
+        Parámetros:
+        - url_deadline (float): segundos máximos por URL (None = sin límite). Superarlo es
+                                un fallo permanente (WatchdogDeadline), no se reintenta.
+        - phase_deadlines (dict): fase → segundos; se combina con PHASE_DEADLINES.
+        - stall_deadline (float): segundos sin progreso en PROGRESS_PHASES (None = sin límite).
+        - interval (float): segundos entre revisiones.
+        """
+        self.url_deadline = url_deadline
+        self.phase_deadlines = {**PHASE_DEADLINES, **(phase_deadlines or {})}
+        self.stall_deadline = stall_deadline
+        self.interval = interval
+        self.trackers = set()
+        self.zombies = {}      # fase → páginas cerradas por el watchdog
+        self.crashes = 0
+        self._task = None
+
+
+    def track(self, label, page) -> PhaseTracker:
+        """
+        Empieza a vigilar `page` para la tarea actual. `label` identifica la página en los logs.
+        """
+        tracker = PhaseTracker(label, page, asyncio.current_task())
+        page.on("crash", lambda _: setattr(tracker, "crashed", True))
+        self.trackers.add(tracker)
+        _current_tracker.set(tracker)
+        return tracker
+
+
+    def release(self, tracker):
+        """
+        Deja de vigilar la página. Se llama al salir de la fase de scraping, sin `await` previo.
+        """
+        self.trackers.discard(tracker)
+        if _current_tracker.get() is tracker:
+            _current_tracker.set(None)
+
+
+    @staticmethod
+    def absorb(tracker) -> bool:
+        """
+        Llamar desde `except asyncio.CancelledError`: True si la cancelación vino del
+        watchdog (se absorbe y el trabajo sigue como fallo), False si hay que propagarla.
+        """
+        if tracker.hung is None:
+            return False
+        uncancel = getattr(tracker.task, "uncancel", None)  # Python 3.11+
+        if uncancel:
+            uncancel()
+        return True
+
+
+    def _expired(self, tracker, now) -> str | None:
+        if tracker.crashed:
+            self.crashes += 1
+            return f"renderer crashed during phase '{tracker.phase}'"
+        if self.url_deadline and now - tracker.started > self.url_deadline:
+            tracker.permanent = True
+            return f"URL deadline of {self.url_deadline:g}s exceeded in phase '{tracker.phase}'"
+        limit = self.phase_deadlines.get(tracker.phase)
+        if limit and now - tracker.phase_started > limit:
+            return f"phase '{tracker.phase}' exceeded {limit:g}s"
+        if (self.stall_deadline and tracker.phase in PROGRESS_PHASES
+                and now - tracker.last_progress > self.stall_deadline):
+            return f"no progress in phase '{tracker.phase}' for {self.stall_deadline:g}s"
+        return None
+
+
+    def check(self):
+        """
+        Revisa todas las páginas activas. Sin `await` entre la revisión y `cancel()`:
+        la tarea sigue dentro de su fase de scraping cuando recibe la cancelación.
+        """
+        now = time.monotonic()
+        for tracker in list(self.trackers):
+            reason = self._expired(tracker, now)
+            if reason is None:
+                continue
+            tracker.hung = tracker.phase
+            tracker.reason = reason
+            self.zombies[tracker.phase] = self.zombies.get(tracker.phase, 0) + 1
+            self.release(tracker)
+            tracker.task.cancel()
+            asyncio.ensure_future(self.close_page(tracker.page))
+            logger.log(f"[{tracker.label}] [WARNING] Watchdog: {reason}. Page force-closed.", "warning")
+
+
+    @staticmethod
+    async def close_page(page, timeout=10):
+        """
+        Cierra la página sin quedarse esperando a un renderer que no responde.
+        """
+        try:
+            if not page.is_closed():
+                await asyncio.wait_for(page.close(), timeout)
+        except Exception:
+            pass
+
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+    def status(self) -> dict:
+        return {
+            "zombies": sum(self.zombies.values()),
+            "zombies_by_phase": dict(self.zombies),
+            "renderer_crashes": self.crashes,
+            "watched_pages": len(self.trackers),
+        }
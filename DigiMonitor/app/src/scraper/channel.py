@@ -0,0 +1,167 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import time
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.scheduler.watchdog import Watchdog
+
+
+class ChannelStage:
+    """
+    Segunda etapa del pipeline: metadatos "Acerca de" de cada canal.
+
+    - Los trabajos de video emiten el channel_id (URL del canal) con `fetch()`.
+    - Cada canal único se visita una sola vez por ejecución (las llamadas repetidas
+      reciben la misma tarea), en su propia pestaña y con su propio límite de
+      concurrencia, independiente de las pestañas de video.
+    - El resultado se une al JSON del video por channel_id.
+
+    En el daemon, `ttl` (segundos) hace que un canal se vuelva a visitar pasado ese tiempo,
+    y las entradas vencidas y terminadas se descartan para que la caché no crezca sin límite.
+    Una visita fallida no se guarda: los videos que ya la esperaban reciben los valores
+    vacíos, pero el siguiente video del mismo canal vuelve a intentarlo.
+    """
+
+    def __init__(self, scraper, context, max_concurrent=2, ttl=None):
+        self.scraper = scraper
+        self.context = context
+        self.sem = asyncio.Semaphore(max_concurrent)
+        self.ttl = ttl
+        self.tasks = {}         # channel_id → (creado, asyncio.Task), en orden de creación
+        self.active_pages = 0
+        self.fetched = 0        # Canales visitados
+        self.failed = 0         # Visitas fallidas (no se guardan en caché)
+        self.requested = 0      # Peticiones de los videos (visitados + reutilizados)
+
+
+    @staticmethod
+    def empty() -> dict:
+        return {
+            "channel_region": 'None',
+            "channel_creation": 'None',
+            "channel_total_videos": 'None',
+            "channel_total_views": 'None',
+        }
+
+
+    def fetch(self, channel_id, live_index) -> asyncio.Future:
+        """
+        Devuelve la tarea (compartida) que obtiene los metadatos del canal.
+        """
+        self.requested += 1
+        if not channel_id:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self.empty())
+            return future
+
+        self._evict()
+        cached = self.tasks.get(channel_id)
+        if cached and (self.ttl is None or time.monotonic() - cached[0] < self.ttl):
+            return cached[1]
+
+        task = asyncio.create_task(self._fetch(channel_id, live_index))
+        self.tasks.pop(channel_id, None)  # Reinsertar al final: el orden sigue siendo por creación
+        self.tasks[channel_id] = (time.monotonic(), task)
+        return task
+
+
+    def _evict(self):
+        """
+        Descarta desde el principio las entradas vencidas cuya visita ya terminó.
+        """
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        while self.tasks:
+            channel_id, (created, task) = next(iter(self.tasks.items()))
+            if now - created < self.ttl or not task.done():
+                break
+            del self.tasks[channel_id]
+
+
+    async def _fetch(self, channel_url, live_index) -> dict:
+        """
+        Abre el canal en una pestaña propia, expande la descripción ("...más") y
+        extrae región, fecha de creación, total de videos y total de vistas.
+        """
+        scraper = self.scraper
+        data = self.empty()
+        failed = True
+        async with self.sem:
+            page = await self.context.new_page()
+            self.active_pages += 1
+            tracker = scraper.watchdog.track(f"URL {live_index+1}", page)
+            tracker.enter("channel")
+            try:
+                if scraper.har:
+                    await scraper.har.attach(page, channel_url)
+                await scraper.pacer.navigate()
+                await page.goto(channel_url, wait_until="domcontentloaded", timeout=scraper.timeouts.ms("navigate"))
+                logger.log(f"[URL {live_index+1}] Opened channel page: {channel_url}")
+
+                # Expandir la descripción del canal (abre el diálogo "Acerca de")
+                more_button = page.locator('button.yt-truncated-text__absolute-button')
+                try:
+                    await more_button.first.click(timeout=scraper.timeouts.ms("ready"))
+                    await page.wait_for_selector('ytd-about-channel-renderer', timeout=10_000)
+                except Exception:
+                    logger.log(f"[URL {live_index+1}] [INFO] Expand description button not found, details already visible.")
+
+                data["channel_region"] = await scraper._extract_channel_region(page, live_index)
+                data["channel_creation"] = await scraper._extract_channel_creation(page, live_index)
+                data["channel_total_videos"] = await scraper._extract_channel_total_videos(page, live_index)
+                data["channel_total_views"] = await scraper._extract_channel_total_views(page, live_index)
+                self.fetched += 1
+                failed = False
+
+            except asyncio.CancelledError:
+                # Página colgada: los videos que esperan este canal reciben los valores vacíos
+                if not Watchdog.absorb(tracker):
+                    raise
+
+            except Exception as error:
+                logger.log(f"[URL {live_index+1}] [WARNING] Error in channel stage for {channel_url}: {str(error)}")
+
+            finally:
+                scraper.watchdog.release(tracker)
+                self.active_pages -= 1
+                await Watchdog.close_page(page)
+
+        if failed:
+            self.failed += 1
+            cached = self.tasks.get(channel_url)
+            if cached and cached[1] is asyncio.current_task():
+                del self.tasks[channel_url]
+        return data
+
+
+    async def close(self):
+        """
+        Espera a que terminen las visitas de canal pendientes.
+        """
+        await asyncio.gather(*(task for _, task in self.tasks.values()), return_exceptions=True)
+
+
+    def status(self) -> dict:
+        return {
+            "channels_fetched": self.fetched,
+            "channels_failed": self.failed,
+            "channel_requests": self.requested,
+            "active_channel_pages": self.active_pages,
+        }
@@ -0,0 +1,139 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import time
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.scheduler.watchdog import Watchdog
+from DigiMonitor.app.src.utils.urls import listing_url, video_id_from_url, watch_url
+
+
+# Lee solo los elementos nuevos del listado (desde `start`) y si queda una continuación
+# por cargar; así cada iteración de scroll no vuelve a recorrer toda la lista.
+LISTING_ITEMS_SCRIPT = """
+(start) => {
+    const items = document.querySelectorAll(
+        'ytd-rich-item-renderer, ytd-playlist-video-renderer, ytd-video-renderer, ytd-grid-video-renderer, ytd-reel-item-renderer'
+    );
+    const hrefs = [];
+    for (let i = start; i < items.length; i++) {
+        const link = items[i].querySelector('a#video-title-link, a#video-title, a#thumbnail, a[href*="/shorts/"]');
+        hrefs.push(link ? link.href : null);
+    }
+    return {
+        total: items.length,
+        hrefs: hrefs,
+        more: !!document.querySelector('ytd-continuation-item-renderer'),
+    };
+}
+"""
+
+
+class ListingExpander:
+    """
+    Expande URLs de canal, playlist y búsqueda en URLs de video, de forma incremental.
+
+    `expand()` es un generador asíncrono: cada tanda de videos nuevos se entrega
+    en cuanto aparece en la página, antes de hacer scroll para cargar la siguiente,
+    así el scraping se solapa con el descubrimiento. Usa una pestaña propia.
+
+    La pestaña del listado no pasa por el watchdog: cada `page.evaluate` tiene su propio
+    límite de tiempo, así un renderer colgado termina el listado en lugar de bloquear
+    el descubrimiento (y con él el cierre de la cola) para siempre.
+    """
+
+    def __init__(self, scraper, context, max_videos=None, idle_rounds=3):
+        """
+        Parámetros:
+        - scraper (YTScraper): aporta el pacer y los timeouts.
+        - context: contexto del navegador.
+        - max_videos (int): videos máximos por listado (None = todos).
+        - idle_rounds (int): scrolls seguidos sin elementos nuevos antes de dar el listado por terminado.
+        """
+        self.scraper = scraper
+        self.context = context
+        self.max_videos = max_videos
+        self.idle_rounds = idle_rounds
+        self.discovered = 0
+
+
+    async def _evaluate(self, page, script, arg=None):
+        """
+        `page.evaluate` con límite de tiempo (el de la fase "ready", 30 s si no hay).
+        """
+        return await asyncio.wait_for(page.evaluate(script, arg), self.scraper.timeouts.ready or 30)
+
+
+    async def _wait_for_more(self, page, total, timeout) -> dict:
+        """
+        Espera a que el listado crezca tras un scroll (o a que no quede continuación).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            state = await self._evaluate(page, LISTING_ITEMS_SCRIPT, total)
+            if state["total"] > total or not state["more"] or time.monotonic() >= deadline:
+                return state
+            await asyncio.sleep(0.3)
+
+
+    async def expand(self, url, live_index):
+        """
+        Genera las URLs de video (canónicas, /watch?v=ID) de un listado, sin repetir.
+        """
+        target = listing_url(url)
+        scraper = self.scraper
+        page = await self.context.new_page()
+        seen = set()
+        try:
+            if scraper.har:
+                await scraper.har.attach(page, target)
+            await scraper.pacer.navigate()
+            await page.goto(target, wait_until="domcontentloaded", timeout=scraper.timeouts.ms("navigate"))
+            logger.log(f"[LIST {live_index+1}] Expanding listing: {target}")
+
+            total = 0
+            idle = 0
+            state = await self._wait_for_more(page, 0, scraper.timeouts.ready or 30)
+            while True:
+                for href in state["hrefs"]:
+                    video_id = video_id_from_url(href)
+                    if video_id and video_id not in seen:
+                        seen.add(video_id)
+                        self.discovered += 1
+                        yield watch_url(video_id)
+                        if self.max_videos and len(seen) >= self.max_videos:
+                            logger.log(f"[LIST {live_index+1}] Budget reached: {len(seen)} videos.")
+                            return
+
+                idle = idle + 1 if state["total"] == total else 0
+                total = state["total"]
+                if not state["more"] or idle >= self.idle_rounds:
+                    break
+
+                await scraper.pacer.scroll()
+                await self._evaluate(page, "window.scrollTo(0, document.documentElement.scrollHeight)")
+                state = await self._wait_for_more(page, total, scraper.timeouts.ready or 30)
+
+            logger.log(f"[LIST {live_index+1}] Listing exhausted: {len(seen)} videos.")
+
+        except Exception as error:
+            reason = "page did not respond" if isinstance(error, asyncio.TimeoutError) else str(error)
+            logger.log(f"[LIST {live_index+1}] [WARNING] Listing expansion stopped after "
+                       f"{len(seen)} videos: {reason}", "warning")
+        finally:
+            await Watchdog.close_page(page)
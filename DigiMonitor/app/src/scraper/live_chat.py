@@ -0,0 +1,221 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.utils.urls import video_id_from_url
+
+
+# Observador dentro de la página del chat:
+# - Un MutationObserver lee cada mensaje nuevo al insertarse (sin volver a recorrer la lista).
+# - Los mensajes esperan en un búfer hasta que Python los drena.
+# - drain(keep) además poda el DOM, dejando solo los últimos `keep` elementos.
+# - Los IDs vistos se guardan en un conjunto acotado (FIFO) para no duplicar re-renderizados.
+CHAT_OBSERVER_SCRIPT = """
+() => {
+    if (window.__digibookChat) return true;
+    const items = document.querySelector('yt-live-chat-item-list-renderer #items');
+    if (!items) return false;
+
+    const buffer = [];
+    const seen = new Set();
+    const seenOrder = [];
+    const SEEN_LIMIT = 5000;
+    let dropped = 0;
+
+    const text = (node) => {
+        if (!node) return null;
+        let out = '';
+        const walk = (n) => {
+            if (n.nodeType === Node.TEXT_NODE) out += n.textContent;
+            else if (n.tagName === 'IMG') out += n.alt || '';
+            else n.childNodes.forEach(walk);
+        };
+        walk(node);
+        return out.trim();
+    };
+
+    const read = (node) => {
+        if (node.nodeType !== 1 || !node.id || seen.has(node.id)) return;
+        if (!node.tagName.startsWith('YT-LIVE-CHAT-')) return;
+        seen.add(node.id);
+        seenOrder.push(node.id);
+        if (seenOrder.length > SEEN_LIMIT) seen.delete(seenOrder.shift());
+        if (buffer.length >= 50000) { dropped += 1; return; }
+        buffer.push({
+            id: node.id,
+            type: node.tagName.toLowerCase().replace('yt-live-chat-', '').replace('-renderer', ''),
+            author: text(node.querySelector('#author-name')),
+            message: text(node.querySelector('#message')),
+            amount: text(node.querySelector('#purchase-amount, #purchase-amount-chip')),
+            timestamp: text(node.querySelector('#timestamp')),
+            received_at: Date.now(),
+        });
+    };
+
+    Array.from(items.children).forEach(read);
+    new MutationObserver((mutations) => {
+        for (const m of mutations) m.addedNodes.forEach(read);
+    }).observe(items, { childList: true });
+
+    window.__digibookChat = {
+        drain: (keep) => {
+            const out = buffer.splice(0, buffer.length);
+            const extra = items.children.length - keep;
+            for (let i = 0; i < extra; i++) items.firstElementChild.remove();
+            const lost = dropped;
+            dropped = 0;
+            return { messages: out, dropped: lost };
+        },
+    };
+    return true;
+}
+"""
+
+
+class LiveChatMonitor:
+    """
+    Monitoreo continuo del chat en vivo de varias transmisiones.
+
+    - Abre la vista "popout" del chat (`/live_chat?v=ID`), mucho más ligera que la página del video.
+    - Un observador dentro de la página captura los mensajes nuevos; Python los drena
+      cada `poll_interval` segundos y los agrega a un archivo NDJSON por transmisión.
+    - El DOM del chat se poda a `keep_dom` elementos y nada se acumula del lado de
+      Python, así la memoria se mantiene constante durante horas.
+    - Si la página se cae o recarga, se vuelve a adjuntar con backoff.
+    """
+
+    def __init__(self, scraper, duration=None, poll_interval=2.0, keep_dom=200):
+        """
+        Parámetros:
+        - scraper (YTScraper): aporta URLs, concurrencia, carpeta de salida, navegador y pacer.
+        - duration (float): segundos de monitoreo por transmisión (None = hasta Ctrl+C).
+        - poll_interval (float): segundos entre cada drenado del búfer.
+        - keep_dom (int): mensajes que se conservan en el DOM del chat.
+        """
+        self.scraper = scraper
+        self.duration = duration
+        self.poll_interval = poll_interval
+        self.keep_dom = keep_dom
+        self.totals = {}
+
+
+    @staticmethod
+    def chat_url(url) -> str | None:
+        video_id = video_id_from_url(url)
+        return f"https://www.youtube.com/live_chat?is_popout=1&v={video_id}" if video_id else None
+
+
+    async def _attach(self, page, chat_url, index):
+        await self.scraper.pacer.navigate()
+        await page.goto(chat_url, wait_until="domcontentloaded", timeout=self.scraper.timeouts.ms("navigate"))
+        await page.wait_for_selector('yt-live-chat-item-list-renderer #items', timeout=self.scraper.timeouts.ms("ready"))
+        if not await page.evaluate(CHAT_OBSERVER_SCRIPT):
+            raise RuntimeError("Live chat item list not found")
+        logger.log(f"[LIVE {index+1}] Attached to chat: {chat_url}")
+
+
+    async def _monitor(self, sem, context, url, index):
+        chat_url = self.chat_url(url)
+        if chat_url is None:
+            logger.log(f"[LIVE {index+1}] [WARNING] Not a video URL, skipped: {url}", "warning")
+            return
+
+        video_id = video_id_from_url(url)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.scraper.output_dir, f"live_chat_{video_id}_{stamp}.ndjson")
+        total = 0
+        failures = 0
+
+        async with sem:
+            # El reloj de --live-duration empieza cuando la transmisión obtiene su pestaña,
+            # no cuando entra en la cola del semáforo.
+            deadline = time.monotonic() + self.duration if self.duration else None
+            page = await context.new_page()
+            self.scraper.active_pages += 1
+            try:
+                with open(path, "a", encoding="utf-8") as sink:
+                    attached = False
+                    last_report = time.monotonic()
+                    while deadline is None or time.monotonic() < deadline:
+                        try:
+                            if not attached:
+                                if page.is_closed():
+                                    page = await context.new_page()
+                                await self._attach(page, chat_url, index)
+                                attached = True
+                                failures = 0
+
+                            await asyncio.sleep(self.poll_interval)
+                            batch = await page.evaluate(
+                                "(keep) => window.__digibookChat ? window.__digibookChat.drain(keep) : null",
+                                self.keep_dom
+                            )
+                            if batch is None:  # La página se recargó: volver a inyectar el observador
+                                attached = False
+                                continue
+
+                            messages = batch["messages"]
+                            if messages:
+                                sink.write("".join(
+                                    json.dumps({"video_id": video_id, **m}, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                    for m in messages
+                                ))
+                                sink.flush()
+                                total += len(messages)
+                            if batch["dropped"]:
+                                logger.log(f"[LIVE {index+1}] [WARNING] {batch['dropped']} messages dropped (buffer full).", "warning")
+
+                            if time.monotonic() - last_report >= 60:
+                                last_report = time.monotonic()
+                                logger.log(f"[LIVE {index+1}] {total} messages captured so far.")
+
+                        except Exception as error:
+                            attached = False
+                            failures += 1
+                            backoff = min(60, 2 ** failures)
+                            logger.log(f"[LIVE {index+1}] [WARNING] Chat detached ({error}). Reattaching in {backoff}s.", "warning")
+                            await asyncio.sleep(backoff)
+            finally:
+                self.scraper.active_pages -= 1
+                self.totals[url] = total
+                if not page.is_closed():
+                    await page.close()
+                logger.log(f"[LIVE {index+1}] Stopped. {total} messages saved in: {path}")
+
+
+    async def _run(self):
+        sem = asyncio.Semaphore(self.scraper.max_concurrent)
+        if len(self.scraper.urls) > self.scraper.max_concurrent:
+            logger.log(f"[LIVE] [WARNING] {len(self.scraper.urls)} streams but --max-concurrent "
+                       f"{self.scraper.max_concurrent}: extra streams wait for a free tab.", "warning")
+        async with self.scraper.browser_manager() as context:
+            await asyncio.gather(*(
+                self._monitor(sem, context, url, i) for i, url in enumerate(self.scraper.urls)
+            ))
+
+
+    def run(self):
+        try:
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            logger.log(f"[LIVE] Stopped by user. Messages per stream: {self.totals}")
@@ -17,13 +17,32 @@
 
 
 import asyncio
+import os
 import time
 from datetime import datetime
 import pytz
 from bs4 import BeautifulSoup
 from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.utils.catalog import Catalog
+from DigiMonitor.app.src.utils.dedupe import DedupeIndex
 from DigiMonitor.app.src.utils.json import save_json
+from DigiMonitor.app.src.utils.media import MediaStore
+from DigiMonitor.app.src.utils.profiler import RunProfiler
+from DigiMonitor.app.src.utils.timeseries import SeriesStore
+from DigiMonitor.app.src.utils.urls import VIDEO, classify_url, comment_id_from_url, video_id_from_url
 from DigiMonitor.app.src.driver.browser_manager import BrowserManager
+from DigiMonitor.app.src.driver.har import REPLAY, HarArchive
+from DigiMonitor.app.src.driver.lean import strip_page
+from DigiMonitor.app.src.driver.traffic import TrafficStats
+from DigiMonitor.app.src.scraper.channel import ChannelStage
+from DigiMonitor.app.src.scraper.listing import ListingExpander
+from DigiMonitor.app.src.scheduler.jobs import Job, JobScheduler
+from DigiMonitor.app.src.scheduler.ordering import ScrapeHistory, estimate_all, longest_first, simulate_makespan
+from DigiMonitor.app.src.scheduler.pacing import PacingScheduler
+from DigiMonitor.app.src.scheduler.watchdog import Watchdog, report_progress
+from DigiMonitor.app.src.scheduler.retry import (
+    THROTTLED, TRANSIENT, PhaseTimeouts, RetryPolicy, ThrottledError, check_response, classify_failure
+)
 
 
 class YTScraper:
@@ -37,7 +56,15 @@ class YTScraper:
     - Guarda los resultados en un archivo JSON.
     """
 
-    def __init__(self, urls, max_concurrent, output_dir, headless):
+    def __init__(self, urls, max_concurrent, output_dir, headless,
+                 user_data_dir=None, cache_size_mb=512, prewarm_urls=None, traffic_stats=False,
+                 profile_lock_timeout=None, max_retries=3, timeouts=None, nav_rate=1.0, scroll_rate=5.0, order="longest-first",
+                 max_comments=None, scroll_timeout=None, max_scroll_iterations=None, comment_sort="top",
+                 replies=False, reply_concurrency=4, max_replies_per_thread=None, max_replies_per_video=None,
+                 dedupe_dir=None, dedupe_capacity=10_000_000, layout="flat",
+                 profile=False, stall_threshold=0.1, cprofile=False, lean=False, max_concurrent_channels=2,
+                 media_dir=None, media_concurrency=8, max_videos_per_listing=None,
+                 har_dir=None, har_mode=None, url_deadline=None, phase_deadlines=None, stall_deadline=300):
         """
         Constructor de la clase.
 
@@ -47,26 +74,129 @@ class YTScraper:
                                 (controlado por un semáforo asincrónico).
         - headless (bool): indica si el navegador debe ejecutarse en modo headless 
                             (sin interfaz gráfica). True = headless, False = modo gráfico.
+        - user_data_dir (str): perfil persistente de Chromium (caché HTTP entre ejecuciones).
+        - cache_size_mb (int): límite de la caché en disco del perfil persistente.
+        - profile_lock_timeout (float): espera máxima por un perfil bloqueado por otro proceso
+                                        (None = esperar indefinidamente).
+        - prewarm_urls (list): URLs que se visitan antes del scraping para llenar la caché.
+        - traffic_stats (bool): reporta bytes de red y de caché por URL y en total.
+        - max_retries (int): reintentos por URL para fallos transient/throttled.
+        - timeouts (dict): límites en segundos por fase de `_process_url` (ver PhaseTimeouts).
+        - nav_rate (float): navegaciones por segundo entre todas las pestañas (0 = sin límite).
+        - scroll_rate (float): iteraciones de scroll por segundo entre todas las pestañas (0 = sin límite).
+        - order (str): "longest-first" ordena las URLs por duración esperada (historial de
+                       ejecuciones previas) para minimizar el makespan; "input" respeta el archivo.
+        - max_comments (int): presupuesto de comentarios por URL (None = todos).
+        - scroll_timeout (float): segundos máximos de scroll por URL (None = sin límite).
+        - max_scroll_iterations (int): iteraciones máximas de scroll por URL (None = sin límite).
+        - comment_sort (str): "top" o "newest".
+        - replies (bool): expande y extrae los hilos de respuestas.
+        - reply_concurrency (int): hilos de respuestas cargando a la vez dentro de la página.
+        - max_replies_per_thread (int), max_replies_per_video (int): presupuestos de respuestas.
+        - dedupe_dir (str): carpeta del índice de deduplicación entre ejecuciones (None = desactivado).
+        - dedupe_capacity (int): comentarios esperados en el índice (dimensiona el filtro de Bloom).
+        - layout (str): "flat" (todos los JSON en output_dir) o "sharded" (output_dir/ab/cd/ por
+                        hash del ID de video). En ambos casos cada archivo se registra en el catálogo.
+        - profile (bool): activa el monitor de bloqueos del event loop y el muestreo de pilas.
+        - stall_threshold (float): segundos de bloqueo a partir de los cuales se reporta.
+        - cprofile (bool): con `profile`, guarda además estadísticas de cProfile.
+        - lean (bool): renderizado ligero (viewport pequeño, sin animaciones, reproductor
+                       pausado y sin barra lateral) para reducir CPU por pestaña.
+        - max_concurrent_channels (int): pestañas simultáneas de la etapa de canal.
+        - media_dir (str): almacén de medios direccionado por contenido (None = no se descargan).
+        - media_concurrency (int): descargas de medios simultáneas.
+        - max_videos_per_listing (int): videos máximos por URL de canal/playlist/búsqueda (None = todos).
+        - har_dir (str), har_mode (str): graba ("record") o reproduce sin red ("replay") el
+                                         tráfico de cada URL en archivos HAR (ver HarArchive).
+        - url_deadline (float): límite de reloj por URL del watchdog (None = sin límite).
+                                Una URL que lo supera no se reintenta.
+        - phase_deadlines (dict): fase → límite de reloj en segundos (ver PHASE_DEADLINES).
+        - stall_deadline (float): segundos sin progreso en scroll/extracción/respuestas
+                                  tras los que la página se da por colgada (None = sin límite).
         """
         self.urls = urls
         self.max_concurrent = max_concurrent
         self.headless = headless
         self.output_dir = output_dir
+        self.user_data_dir = user_data_dir
+        self.cache_size_mb = cache_size_mb
+        self.profile_lock_timeout = profile_lock_timeout
+        self.prewarm_urls = prewarm_urls or []
+        self.traffic = TrafficStats() if traffic_stats else None
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
+        self.timeouts = PhaseTimeouts(**(timeouts or {}))
+        self.har = HarArchive(har_dir, har_mode) if har_dir else None
+        if self.har and har_mode == REPLAY:
+            nav_rate = scroll_rate = 0  # Sin red: no hay a quién proteger con el pacing
+        self.pacer = PacingScheduler(nav_rate=nav_rate, scroll_rate=scroll_rate)
+        self.watchdog = Watchdog(url_deadline=url_deadline, phase_deadlines=phase_deadlines,
+                                 stall_deadline=stall_deadline)
+        self.order = order
+        self.max_comments = max_comments
+        self.scroll_timeout = scroll_timeout
+        self.max_scroll_iterations = max_scroll_iterations
+        self.comment_sort = comment_sort
+        self.replies = replies
+        self.reply_concurrency = reply_concurrency
+        self.max_replies_per_thread = max_replies_per_thread
+        self.max_replies_per_video = max_replies_per_video
+        self.dedupe = DedupeIndex(dedupe_dir, capacity=dedupe_capacity) if dedupe_dir else None
+        self.layout = layout
+        self.catalog = Catalog(output_dir)
+        self.series = SeriesStore(output_dir)  # Contadores por video/canal (output_dir/timeseries)
+        self.profiler = (
+            RunProfiler(os.path.join(output_dir, "profiles"), threshold=stall_threshold, cprofile=cprofile)
+            if profile else None
+        )
+        self.lean = lean
+        self.max_concurrent_channels = max_concurrent_channels
+        self.media = MediaStore(media_dir, max_concurrent=media_concurrency) if media_dir else None
+        self.max_videos_per_listing = max_videos_per_listing
+        self.join_slots = asyncio.Semaphore(max_concurrent * 4)  # Resultados esperando canal/medios/guardado
+        self.channel_stage = None  # ChannelStage (se crea con el contexto del navegador)
+        self.active_pages = 0  # Páginas abiertas en este momento (expuesto por el daemon en /status)
+
+
+    def browser_manager(self) -> BrowserManager:
+        """
+        Crea el BrowserManager con la configuración del scraper.
+        """
+        return BrowserManager(
+            headless=self.headless,
+            user_data_dir=self.user_data_dir,
+            cache_size_mb=self.cache_size_mb,
+            lean=self.lean,
+            profile_lock_timeout=self.profile_lock_timeout
+        )
 
 
 #ACTIONS
-    async def _scrolldown(self, page, live_index, step=449, small_step=169, delay=0.3, max_attempts=3):
+    async def _scrolldown(self, page, live_index, budget=None, step=449, small_step=169, delay=0.3, max_attempts=3):
         """
         Realiza un scroll en el contenedor de comentarios para forzar la carga de más datos.
         
         Parámetros:
         - page: página Playwright activa.
         - live_index (int): índice del live (para logs).
+        - budget (dict): {"started", "iterations"} compartido por todas las pasadas de scroll
+                         de la misma URL, así un segundo scroll no reinicia los presupuestos.
         - step (int): tamaño del scroll hacia abajo.
         - small_step (int): paso pequeño hacia arriba (para "despertar" carga dinámica).
         - delay (float): tiempo de espera entre scrolls (en segundos).
         - max_attempts (int): número máximo de intentos para detectar cambios en altura.
+
+        Se detiene antes si se cumple algún presupuesto del scraper (max_comments,
+        scroll_timeout, max_scroll_iterations).
+
+        Retorna el motivo de parada: "complete" (no hay más comentarios) o el
+        nombre del presupuesto alcanzado.
         """
+        if budget is None:
+            budget = {"started": None, "iterations": 0}
+        if budget["started"] is None:
+            budget["started"] = time.monotonic()
+        iterations = 0
+        stop_reason = "complete"
 
         # Altura inicial del contenedor de comentarios (#contents)
         page_init_height = await page.evaluate("""
@@ -85,6 +215,19 @@ class YTScraper:
 
         # Repetir scroll hasta que no haya más cambios en la altura
         while current_attempt < max_attempts:
+            # Presupuestos por URL: latencia acotada aunque el video tenga miles de comentarios
+            if self.max_scroll_iterations and budget["iterations"] >= self.max_scroll_iterations:
+                stop_reason = "max_scroll_iterations"
+                break
+            if self.scroll_timeout and time.monotonic() - budget["started"] >= self.scroll_timeout:
+                stop_reason = "scroll_timeout"
+                break
+            iterations += 1
+            budget["iterations"] += 1
+
+            # Cada iteración dispara cargas de comentarios: respeta el ritmo global
+            await self.pacer.scroll()
+
             # Scroll hacia abajo dos veces
             for _ in range(2):
                 await page.evaluate(f"window.scrollBy(0, {step});")
@@ -94,14 +237,23 @@ class YTScraper:
             await page.evaluate(f"window.scrollBy(0, -{small_step});")
             await asyncio.sleep(delay)
 
-            # Revisar si la altura del contenedor cambió
-            page_last_height = await page.evaluate("""
+            # Revisar si la altura del contenedor cambió (y cuántos comentarios hay cargados)
+            page_last_height, loaded_comments = await page.evaluate("""
                 () => {
                     const container = document.querySelector('ytd-item-section-renderer #contents');
-                    return container ? container.scrollHeight : 0;
+                    return [
+                        container ? container.scrollHeight : 0,
+                        document.querySelectorAll('ytd-comment-thread-renderer').length
+                    ];
                 }
             """)
 
+            report_progress()  # La página responde: el watchdog mide estancamiento, no duración
+
+            if self.max_comments and loaded_comments >= self.max_comments:
+                stop_reason = "max_comments"
+                break
+
             if page_last_height == page_init_height:
                 # No hubo cambio, contamos un intento fallido
                 current_attempt += 1
@@ -113,7 +265,141 @@ class YTScraper:
                 page_init_height = page_last_height
                 current_attempt = 0
 
-        logger.log(f"[URL {live_index+1}] Scrolling complete.")
+        logger.log(f"[URL {live_index+1}] Scrolling complete ({stop_reason}, {iterations} iterations).")
+        return stop_reason
+
+
+    async def _select_comment_sort(self, page, live_index) -> str:
+        """
+        Cambia el orden de los comentarios a "Newest" / "Más recientes".
+        "Top" es el orden por defecto de YouTube, así que no requiere clic.
+
+        Retorna el orden realmente aplicado: "newest", o "top" si no se pidió o falló el cambio.
+        """
+        if self.comment_sort != "newest":
+            return "top"
+        try:
+            # La cabecera de comentarios se carga de forma diferida: bajar hasta ella
+            header = page.locator('ytd-comments-header-renderer #sort-menu').first
+            for _ in range(10):
+                if await header.count() > 0:
+                    break
+                await page.evaluate("window.scrollBy(0, 449);")
+                await asyncio.sleep(0.3)
+            await header.locator('#trigger, tp-yt-paper-button').first.click(timeout=10_000)
+            # Opciones del menú: 0 = Top comments, 1 = Newest first. Solo los items:
+            # cada item va dentro de un <a>, así que no se mezclan ambos selectores.
+            option = page.locator('tp-yt-paper-listbox#menu tp-yt-paper-item').nth(1)
+            await option.click(timeout=10_000)
+            await asyncio.sleep(1)
+            await page.evaluate("window.scrollTo(0, 0)")
+            logger.log(f"[URL {live_index+1}] Comment sort set to newest.")
+            return "newest"
+        except Exception as error:
+            logger.log(f"[URL {live_index+1}] [WARNING] An error occurred in '_select_comment_sort': {str(error)}")
+            return "top"
+
+
+    async def _expand_replies(self, page, live_index, max_threads) -> int:
+        """
+        Expande los hilos de respuestas ("N respuestas") de forma concurrente dentro de la página.
+
+        - Hasta `reply_concurrency` hilos se cargan a la vez (cada uno: clic y espera de su continuación).
+        - En cada hilo se siguen los botones "Mostrar más respuestas" hasta `max_replies_per_thread`.
+        - Se dejan de abrir hilos al alcanzar `max_replies_per_video`.
+
+        Solo se consideran los primeros `max_threads` hilos (los comentarios ya extraídos).
+        Se procesan en tandas de `2 * reply_concurrency` hilos, informando progreso al
+        watchdog entre tandas. Retorna el número de hilos expandidos.
+        """
+        expanded = 0
+        remaining = self.max_replies_per_video or 1_000_000_000
+        chunk = self.reply_concurrency * 2
+        try:
+            for start in range(0, max_threads, chunk):
+                if remaining <= 0:
+                    break
+                batch = await self._expand_replies_batch(page, start, min(start + chunk, max_threads), remaining)
+                expanded += batch["expanded"]
+                remaining -= batch["total"]
+                report_progress()
+            logger.log(f"[URL {live_index+1}] Expanded {expanded} reply threads.")
+        except Exception as error:
+            logger.log(f"[URL {live_index+1}] [WARNING] An error occurred in '_expand_replies': {str(error)}")
+        return expanded
+
+
+    async def _expand_replies_batch(self, page, start, end, per_video) -> dict:
+        """
+        Expande los hilos [start, end) dentro de la página. Retorna {"expanded", "total"}.
+        """
+        return await page.evaluate("""
+                async ({start, end, concurrency, perThread, perVideo, timeoutMs}) => {
+                    const threads = Array.from(document.querySelectorAll('ytd-comment-thread-renderer')).slice(start, end);
+                    const queue = threads.filter(t => t.querySelector('ytd-comment-replies-renderer #more-replies button'));
+                    const countReplies = t => t.querySelectorAll(
+                        'ytd-comment-replies-renderer ytd-comment-view-model, ytd-comment-replies-renderer ytd-comment-renderer'
+                    ).length;
+                    const waitMore = (t, previous) => new Promise(resolve => {
+                        const began = Date.now();
+                        const check = () => {
+                            if (countReplies(t) > previous || Date.now() - began > timeoutMs) resolve();
+                            else setTimeout(check, 100);
+                        };
+                        check();
+                    });
+                    let total = 0;
+                    let expanded = 0;
+                    const worker = async () => {
+                        while (queue.length && total < perVideo) {
+                            const thread = queue.shift();
+                            thread.querySelector('ytd-comment-replies-renderer #more-replies button').click();
+                            await waitMore(thread, 0);
+                            // Continuaciones: "Mostrar más respuestas" dentro del hilo
+                            while (countReplies(thread) < perThread && total + countReplies(thread) < perVideo) {
+                                const more = thread.querySelector('ytd-comment-replies-renderer ytd-continuation-item-renderer button');
+                                if (!more) break;
+                                const previous = countReplies(thread);
+                                more.click();
+                                await waitMore(thread, previous);
+                                if (countReplies(thread) === previous) break;
+                            }
+                            total += Math.min(countReplies(thread), perThread);
+                            expanded += 1;
+                        }
+                    };
+                    await Promise.all(Array.from({length: concurrency}, worker));
+                    return {expanded: expanded, total: total};
+                }
+            """, {
+                "start": start,
+                "end": end,
+                "concurrency": self.reply_concurrency,
+                "perThread": self.max_replies_per_thread or 1_000_000,
+                "perVideo": per_video,
+                "timeoutMs": 10_000,
+            })
+
+
+    async def _detect_throttling(self, page) -> str | None:
+        """
+        Busca señales de throttling en la página ya desplazada: sección #below vacía o
+        sección de comentarios sin cabecera (y sin mensaje de "comentarios desactivados").
+        Las transmisiones y estrenos (con chat en vivo) tienen ese DOM sin estar limitados,
+        así que no cuentan. Retorna el motivo o None.
+        """
+        return await page.evaluate("""
+            () => {
+                const below = document.querySelector('#below');
+                if (!below || below.innerText.trim().length === 0) return 'empty #below section';
+                const comments = document.querySelector('ytd-comments#comments');
+                const disabled = document.querySelector('ytd-comments ytd-message-renderer');
+                const header = document.querySelector('ytd-comments-header-renderer');
+                const live = document.querySelector('ytd-live-chat-frame');
+                if (comments && !disabled && !header && !live) return 'missing comments section';
+                return null;
+            }
+        """)
 
 
     async def _expand_description(self, page):
@@ -141,52 +427,6 @@ class YTScraper:
             return None
 
 
-    async def _click_channel_and_expand_region(self, page, live_index) -> dict:
-        """
-        Da click en el enlace del canal, expande la descripción y extrae la región del canal.
-        """
-        data = {"channel_region": 'None',
-                "channel_creation": 'None',
-                "channel_total_videos": 'None',
-                "channel_total_views": 'None',
-                "date_scraping": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-
-        try:
-            # 1 Hacer click en el enlace del canal
-            channel_link_xpath = (
-                '//yt-formatted-string[@id="text" and contains(@class, "ytd-channel-name")]'
-                '/a[@class="yt-simple-endpoint style-scope yt-formatted-string"]'
-            )
-            channel_element = page.locator(channel_link_xpath)
-
-            if await channel_element.count() > 0:
-                await channel_element.first.click()
-                logger.log(f"[URL {live_index+1}] Clicked on channel link successfully.")
-                await asyncio.sleep(1)
-                # 2 Esperar y hacer click en el botón para expandir la descripción
-                more_button = page.locator('button.yt-truncated-text__absolute-button')
-                if await more_button.count() > 0:
-                    await more_button.first.click()
-                    logger.log(f"[URL {live_index+1}] Clicked the description expand button successfully.")
-                else:
-                    logger.log(f"[URL {live_index+1}] [INFO] Expand description button not found, details already visible.")
-                time.sleep(5)
-                # 3 Extraer la región del canal
-                data['channel_region'] = await self._extract_channel_region(page, live_index)
-                data['channel_creation'] = await self._extract_channel_creation(page, live_index)
-                data['channel_total_videos'] = await self._extract_channel_total_videos(page, live_index)
-                data['channel_total_views'] = await self._extract_channel_total_views(page, live_index)
-
-            else:
-                logger.log(f"[URL {live_index+1}] [WARNING] Channel link element not found.")
-
-        except Exception as error:
-            logger.log(f"[URL {live_index+1}] [WARNING] Error during click or extraction: {str(error)}")
-
-        return data
-
-
 
 # XPATHS
     async def _extract_id_channel(self, page, live_index) -> str | None:
@@ -468,39 +708,31 @@ class YTScraper:
             items = page.locator(f"xpath={xpath}")
             count = await items.count()
             for i in range(count):
+                report_progress()
+                # None para avatares aún sin cargar: la lista queda alineada con los comentarios
                 src = await items.nth(i).get_attribute("src")
-                if src:
-                    results.append(src)
+                results.append(src or None)
         except Exception as error:
-            logger.warning(f"[URL {live_index+1}] [WARNING] Error in '_extract_imgs_profile_comments': {str(error)}")
+            logger.log(f"[URL {live_index+1}] [WARNING] Error in '_extract_imgs_profile_comments': {str(error)}")
         return results
 
 
     async def _extract_usernames(self, page, live_index) -> list[str] | None:
         xpath = '//div[@id="header-author"]'
         try:
-            header_elements = page.locator(xpath)
-            count = await header_elements.count()
-            if count == 0:
+            # Un solo viaje al navegador: el texto del <a> (o su href), o si no hay <a>, el del <span>
+            usernames = await page.locator(xpath).evaluate_all("""
+                els => els.map(element => {
+                    const a = element.querySelector('a');
+                    const span = element.querySelector('span');
+                    const text = a ? (a.innerText || a.getAttribute('href')) : (span ? span.innerText : null);
+                    return text ? text.trim() : null;
+                })
+            """)
+            if not usernames:
                 logger.log(f"[URL {live_index+1}] [WARNING] No header-author elements found in '_extract_usernames'.")
                 return None
-
-            usernames = []
-            for i in range(count):
-                element = header_elements.nth(i)
-                text = None
-                # Intentamos el <a>
-                a_elem = element.locator('a').first
-                if await a_elem.count() > 0:
-                    text = await a_elem.inner_text() or await a_elem.get_attribute('href')
-                else:
-                    # Si no hay <a>, intentamos el <span>
-                    span_elem = element.locator('span').first
-                    if await span_elem.count() > 0:
-                        text = await span_elem.inner_text()
-                usernames.append(text.strip() if text else None)
-
-            return usernames
+            return [name or None for name in usernames]
 
         except Exception as error:
             logger.log(f"[URL {live_index+1}] [WARNING] An error occurred in '_extract_usernames': {str(error)}")
@@ -518,6 +750,7 @@ class YTScraper:
 
             results = []
             for i in range(count):
+                report_progress()
                 block = comment_blocks.nth(i)
                 html = await block.inner_html()
                 soup = BeautifulSoup(html, 'html.parser')
@@ -551,6 +784,7 @@ class YTScraper:
 
             likes = []
             for i in range(count):
+                report_progress()
                 item = like_elements.nth(i)
                 text = await item.inner_text()
                 if text:
@@ -563,6 +797,17 @@ class YTScraper:
             return None
 
 
+    async def _extract_comment_ids(self, page, live_index) -> list[str | None] | None:
+        xpath = '//span[@id="published-time-text"]/a'
+        try:
+            # Un solo viaje al navegador para todos los enlaces (mismos elementos que '_extract_dates')
+            hrefs = await page.locator(xpath).evaluate_all("els => els.map(e => e.getAttribute('href'))")
+            return [comment_id_from_url(href) for href in hrefs]
+        except Exception as error:
+            logger.log(f"[URL {live_index+1}] [WARNING] An error occurred in '_extract_comment_ids': {str(error)}")
+            return None
+
+
     async def _extract_dates(self, page, live_index) -> list[str] | None:
         xpath = '//span[@id="published-time-text"]/a'
         try:
@@ -574,6 +819,7 @@ class YTScraper:
 
             dates = []
             for i in range(count):
+                report_progress()
                 item = date_elements.nth(i)
                 text = await item.inner_text()
                 if text:
@@ -587,6 +833,58 @@ class YTScraper:
 
 
     # Metadata
+    async def _extract_replies(self, page, live_index, max_threads) -> list[list[dict]] | None:
+        """
+        Extrae en una sola llamada (un solo viaje al navegador) las respuestas de los
+        primeros `max_threads` hilos. La posición i de la lista corresponde al comentario
+        i de "comments_text"; cada respuesta lleva "parent_index" con esa posición.
+        """
+        try:
+            return await page.evaluate("""
+                ({maxThreads, perThread, perVideo}) => {
+                    const text = (node) => {
+                        if (!node) return null;
+                        let out = '';
+                        const walk = (n) => {
+                            if (n.nodeType === Node.TEXT_NODE) out += n.textContent;
+                            else if (n.tagName === 'IMG') out += n.alt || '';
+                            else n.childNodes.forEach(walk);
+                        };
+                        walk(node);
+                        return out.trim();
+                    };
+                    let total = 0;
+                    return Array.from(document.querySelectorAll('ytd-comment-thread-renderer')).slice(0, maxThreads).map((thread, parent) => {
+                        const nodes = Array.from(thread.querySelectorAll(
+                            'ytd-comment-replies-renderer ytd-comment-view-model, ytd-comment-replies-renderer ytd-comment-renderer'
+                        ));
+                        const replies = [];
+                        for (const reply of nodes.slice(0, perThread)) {
+                            if (total >= perVideo) break;
+                            total += 1;
+                            const link = reply.querySelector('#published-time-text a');
+                            replies.push({
+                                parent_index: parent,
+                                author: text(reply.querySelector('#author-text')),
+                                text: text(reply.querySelector('#content-text')),
+                                likes: text(reply.querySelector('#vote-count-middle')),
+                                date: text(link),
+                                url: link ? link.href : null,
+                            });
+                        }
+                        return replies;
+                    });
+                }
+            """, {
+                "maxThreads": max_threads,
+                "perThread": self.max_replies_per_thread or 1_000_000,
+                "perVideo": self.max_replies_per_video or 1_000_000_000,
+            })
+        except Exception as error:
+            logger.log(f"[URL {live_index+1}] [WARNING] An error occurred in '_extract_replies': {str(error)}")
+            return None
+
+
     async def _extract_channel_region(self, page, live_index) -> str:
         xpath = ('//tr[@class="description-item style-scope ytd-about-channel-renderer"]'
                 '/td[yt-icon[@icon="privacy_public"]]'
@@ -660,17 +958,56 @@ class YTScraper:
 #JSON
     async def _process_url(self, sem, context, url, index):
         """
-        Procesa un video de YouTube.
+        Procesa la página de un video de YouTube (primera etapa, dentro del semáforo).
+
+        Retorna (result, video_data, channel_task):
+        - result: {"index", "url", "status" ("ok" | "error"), "failure", "file_path", "error", "data"}.
+          "failure" es la clase del fallo (transient | throttled | permanent) cuando status = "error".
+          Si el watchdog cerró la página, "hung_phase" indica la fase que se colgó.
+        - video_data: datos extraídos (None si la página falló).
+        - channel_task: tarea de la etapa de canal a unir en `_complete_url`.
         """
+        result = {"index": index + 1, "url": url, "status": "error", "failure": None, "file_path": None, "error": None}
+        video_data = None
+        channel_task = None
         async with sem:
             page = await context.new_page()
+            self.active_pages += 1
+            traffic = await self.traffic.attach(context, page) if self.traffic else None
+            tracker = self.watchdog.track(f"URL {index+1}", page)
             try:
-                await page.goto(url, wait_until="domcontentloaded")
+                if self.har:
+                    await self.har.attach(page, url)
+                await self.pacer.navigate()
+                tracker.enter("navigate")
+                started = time.monotonic()
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=self.timeouts.ms("navigate"))
+                check_response(response, page.url)
                 logger.log(f"[URL {index+1}] Open URL: {url}")
-                await page.wait_for_selector('//div[@id="below" and contains(@class, "style-scope ytd-watch-flexy")]')
+                tracker.enter("ready")
+                await page.wait_for_selector(
+                    '//div[@id="below" and contains(@class, "style-scope ytd-watch-flexy")]',
+                    timeout=self.timeouts.ms("ready")
+                )
+                result["ready_seconds"] = round(time.monotonic() - started, 3)
+                if self.lean:
+                    await strip_page(page)
                 await page.evaluate("window.scrollTo(0, 0)")
 
-                await self._scrolldown(page, index)
+                tracker.enter("sort")
+                comments_sort = await self._select_comment_sort(page, index)
+                tracker.enter("scroll")
+                scroll_budget = {"started": None, "iterations": 0}  # Presupuestos por URL, no por pasada
+                stop_reason = await self._scrolldown(page, index, scroll_budget)
+
+                tracker.enter("extract")
+                throttle_reason = await self._detect_throttling(page)
+                if throttle_reason == "empty #below section":
+                    # Nada que extraer: se reintenta más tarde en el carril de reintentos
+                    raise ThrottledError(throttle_reason)
+                if throttle_reason:
+                    # Señal débil: solo reduce el ritmo si se repite en varias URLs distintas
+                    self.pacer.report_missing_comments(url)
 
                 # Validar consistencia de las listas de comentarios con reintentos
                 max_attempts = 2
@@ -678,12 +1015,25 @@ class YTScraper:
 
                 for attempt in range(max_attempts + 1):  # Primer intento + 2 reintentos
                     if attempt == 1:  # Segundo intento
+                        tracker.enter("scroll")
                         await page.evaluate("window.scrollTo(0, 0)")  # volver al inicio
-                        await self._scrolldown(page, index)           # hacer scroll de nuevo
+                        stop_reason = await self._scrolldown(page, index, scroll_budget)  # hacer scroll de nuevo
+                        tracker.enter("extract")
 
                     comentarios = await self._extract_comments_emojis(page, index)
                     likes = await self._extract_n_likes(page, index)
                     dates = await self._extract_dates(page, index)
+                    comment_ids = await self._extract_comment_ids(page, index)
+                    comment_images = await self._extract_imgs_profile_comments(page, index) if self.media else None
+                    # Autores: clave de deduplicación cuando falta el ID del comentario
+                    comment_authors = await self._extract_usernames(page, index) if self.dedupe else None
+
+                    # Respetar el presupuesto aunque la última carga haya traído de más
+                    if self.max_comments:
+                        comentarios, likes, dates, comment_ids, comment_images, comment_authors = (
+                            lst[:self.max_comments] if lst is not None else None
+                            for lst in (comentarios, likes, dates, comment_ids, comment_images, comment_authors)
+                        )
 
                     comment_lists = [
                         comentarios,
@@ -704,6 +1054,15 @@ class YTScraper:
                             #logger.log(f"Esperando {wait_seconds}s antes de reintentar...")
                             await asyncio.sleep(wait_seconds)  # Espera antes del siguiente intento
 
+                # Respuestas: después de extraer los comentarios principales, porque los
+                # XPaths de comentarios también coincidirían con las respuestas expandidas
+                replies = None
+                if self.replies and comentarios:
+                    tracker.enter("replies")
+                    await self._expand_replies(page, index, len(comentarios))
+                    replies = await self._extract_replies(page, index, len(comentarios))
+
+                tracker.enter("metadata")
                 await self._expand_description(page)
 
                 id_channel = await self._extract_id_channel(page, index)
@@ -725,13 +1084,13 @@ class YTScraper:
 
                 # Guardar resultados
                 video_data = {
-                    "date_scraping": "",
+                    "date_scraping": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "original_url": url,                         # URL original del contenido
                     "channel_id": id_channel,                    # ID del canal
                     "channel_name": full_name_channel,           # Nombre completo del canal
                     "channel_profile_image": profile_image_channel, # Imagen de perfil del canal
                     "channel_subscribers_count": count_subscribers_channel, # Cantidad de suscriptores
-                    "channel_region": "",
+                    "channel_region": "",                        # Metadatos de la etapa de canal
                     "channel_creation": "",
                     "channel_total_videos": "",
                     "channel_total_views": "",
@@ -747,46 +1106,386 @@ class YTScraper:
                     "post_views_count": views,                   # Vistas del post
                     "post_comments": {                           # Información de comentarios
                         "comments_consistent": same_size,        # True o False
+                        "comments_complete": stop_reason == "complete", # False si un presupuesto truncó la lista
+                        "comments_stop_reason": stop_reason,     # complete | max_comments | scroll_timeout | max_scroll_iterations
+                        "comments_sort": comments_sort,          # top | newest (orden realmente aplicado)
                         "comments_length": comments_length,       # int o None
                         "comments_text": comentarios,                 # Texto de comentarios
                         "comment_likes": likes,                       # Likes por comentario
-                        "comment_dates": dates                        # Fechas de comentarios
+                        "comment_dates": dates,                       # Fechas de comentarios
+                        "comment_ids": comment_ids,                   # IDs de comentarios (parámetro lc)
+                        "comment_authors": comment_authors,           # Autores por comentario (solo con --dedupe-index)
+                        "comment_replies": replies,                   # Respuestas por comentario (None si --replies no está activo)
+                        "replies_count": sum(len(r) for r in replies) if replies is not None else None
                     }
                 }
+                if self.media:
+                    video_data["post_comments"]["comment_profile_images"] = comment_images  # Avatares (None si no cargó)
 
-                submetadata = await self._click_channel_and_expand_region(page, index)
-                video_data.update(submetadata)
+                # Etapa de canal: se encola (deduplicada por canal) y se une por channel_id
+                # después de cerrar esta pestaña, que queda libre para el siguiente video.
+                channel_task = self.channel_stage.fetch(id_channel, index)
+                result["comments_count"] = comentarios_count
+                self.pacer.report_success()
 
-                # Guardar inmediatamente en archivo JSON
-                file_path = save_json(video_data, filename=f"youtube_data_live_{index+1}", folder=self.output_dir)
-                logger.log(f"[URL {index+1}] Data saved in: {file_path}")
+            except asyncio.CancelledError:
+                if not Watchdog.absorb(tracker):
+                    raise
+                video_data = None
+                self._record_failure(result, tracker.error(), index)
 
             except Exception as e:
-                logger.log(f"[URL {index+1}] Error in '_process_url': {e}", "warning")
+                video_data = None
+                self._record_failure(result, tracker.error() if tracker.hung else e, index)
 
             finally:
-                if not page.is_closed():
-                    await page.close()
+                self.watchdog.release(tracker)
+                if tracker.hung:
+                    result["hung_phase"] = tracker.hung
+                self.active_pages -= 1
+                await Watchdog.close_page(page)
+                if traffic is not None:
+                    self.traffic.collect(traffic)
+                    result["traffic"] = traffic.as_dict()
+                    logger.log(f"[URL {index+1}] Traffic: {traffic.summary()}")
                 logger.log(f"[URL {index+1}] Page closed after scraping.")
 
+        return result, video_data, channel_task
+
+
+    async def _complete_url(self, result, video_data, channel_task, save):
+        """
+        Segunda etapa, fuera del semáforo y sin ocupar al worker: une los metadatos
+        del canal, descarga los medios y guarda el resultado.
+        """
+        index = result["index"] - 1
+        try:
+            video_data.update(await asyncio.shield(channel_task))
+            if self.media:
+                await self._download_media(video_data, index)
+            self._save_result(video_data, result["url"], index, save, result)
+        except Exception as e:
+            self._record_failure(result, e, index)
+        return result
+
+
+    async def _download_media(self, video_data, index):
+        """
+        Etapa de medios: descarga miniatura, avatar del canal y avatares de comentarios
+        al almacén y agrega a cada URL su hash (`*_hash`). Corre con la pestaña ya cerrada.
+        """
+        comments = video_data["post_comments"]
+        thumbnail, channel_image, comment_hashes = await asyncio.gather(
+            self.media.fetch(video_data["post_thumbnail"]),
+            self.media.fetch(video_data["channel_profile_image"]),
+            self.media.fetch_all(comments.get("comment_profile_images")),
+        )
+        video_data["post_thumbnail_hash"] = thumbnail
+        video_data["channel_profile_image_hash"] = channel_image
+        comments["comment_profile_image_hashes"] = comment_hashes
+        logger.log(f"[URL {index+1}] Media: {self.media.status()}")
+
+
+    def _record_failure(self, result, error, index):
+        """
+        Marca el resultado como fallido, clasifica el error e informa al pacer.
+        """
+        if self.dedupe:
+            self.dedupe.rollback()
+        result["status"] = "error"
+        result["error"] = str(error)
+        result["failure"] = classify_failure(error)
+        if result["failure"] == THROTTLED:
+            self.pacer.report_throttle(str(error))
+        elif result["failure"] == TRANSIENT and "Timeout" in type(error).__name__:
+            self.pacer.report_timeout()
+        logger.log(f"[URL {index+1}] Error in '_process_url' ({result['failure']}): {error}", "warning")
+
+
+    def _save_result(self, video_data, url, index, save, result):
+        """
+        Deduplicación, guardado y confirmación del índice sin `await` intermedios:
+        ninguna otra pestaña puede intercalar sus claves pendientes.
+        """
+        if self.dedupe:
+            self._deduplicate(video_data, video_id_from_url(url) or url, index)
+
+        if save:
+            # Guardar inmediatamente en archivo JSON y registrarlo en el catálogo
+            video_id = video_id_from_url(url)
+            if self.layout == "sharded" and video_id:
+                file_path = save_json(video_data, filename=f"youtube_{video_id}",
+                                      folder=self.output_dir, shard_key=video_id)
+            else:
+                file_path = save_json(video_data, filename=f"youtube_data_live_{index+1}", folder=self.output_dir)
+            self.catalog.add(video_id, video_data["channel_id"], url, file_path)
+            result["file_path"] = file_path
+            logger.log(f"[URL {index+1}] Data saved in: {file_path}")
+        else:
+            result["data"] = video_data
+
+        if self.dedupe:
+            self.dedupe.commit()
+        result["status"] = "ok"
+
+        # Serie de contadores: solo tras un guardado exitoso (un reintento no duplica la instantánea)
+        try:
+            self.series.record(video_data, video_id_from_url(url))
+        except Exception as error:
+            logger.log(f"[URL {index+1}] [WARNING] Time-series snapshot not recorded: {error}", "warning")
+
+
+    def _deduplicate(self, video_data, video_id, index):
+        """
+        Quita de `post_comments` los comentarios (y respuestas) que ya se escribieron
+        en ejecuciones anteriores, según el DedupeIndex. Las listas paralelas se
+        filtran juntas; si no son consistentes no se puede alinear y se escriben completas.
+
+        Clave de cada comentario: su ID; si falta, (autor, texto, video). Un comentario
+        sin ID ni autor alineado se escribe siempre y no se registra: con solo el texto,
+        dos usuarios distintos que escriben lo mismo se fusionarían.
+
+        Las respuestas se deduplican por su propia clave, sin importar el comentario padre:
+        las respuestas nuevas a un comentario ya escrito pasan a `replies_to_known_comments`,
+        cada una con `parent_comment_id` para unirla con el comentario de la ejecución anterior.
+        """
+        comments = video_data["post_comments"]
+        texts = comments["comments_text"]
+        if not texts or not comments["comments_consistent"]:
+            return
+
+        ids = comments.get("comment_ids")
+        if not ids or len(ids) != len(texts):
+            ids = [None] * len(texts)
+        authors = comments.get("comment_authors")
+        if not authors or len(authors) != len(texts):
+            authors = [None] * len(texts)
+        keys = [
+            DedupeIndex.key(comment_id=cid, author=author, text=text, video_id=video_id) if cid or author else None
+            for cid, author, text in zip(ids, authors, texts)
+        ]
+        keyed = [i for i, key in enumerate(keys) if key is not None]
+        mask = [True] * len(keys)
+        for i, new in zip(keyed, self.dedupe.filter_new([keys[i] for i in keyed])):
+            mask[i] = new
+        duplicates = len(mask) - sum(mask)
+        if len(keyed) < len(keys):
+            logger.log(f"[URL {index+1}] [WARNING] Dedupe: {len(keys) - len(keyed)} comments without ID "
+                       f"or author kept without deduplication.", "warning")
+
+        # Respuestas: antes de filtrar los comentarios, para no perder las de padres ya vistos
+        known_parent_replies = []
+        replies = comments.get("comment_replies")
+        if replies is not None and len(replies) == len(mask):
+            for parent, thread in enumerate(replies):
+                reply_ids = [comment_id_from_url(r["url"]) for r in thread]
+                reply_mask = self.dedupe.filter_new([
+                    DedupeIndex.key(comment_id=reply_id, author=r["author"], text=r["text"], video_id=video_id)
+                    for reply_id, r in zip(reply_ids, thread)
+                ])
+                duplicates += len(reply_mask) - sum(reply_mask)
+                kept = [
+                    {**r, "parent_comment_id": ids[parent] or (reply_id.split(".")[0] if reply_id else None)}
+                    for r, reply_id, keep in zip(thread, reply_ids, reply_mask) if keep
+                ]
+                if not mask[parent]:
+                    known_parent_replies.extend({**r, "parent_index": None} for r in kept)
+                    kept = []
+                replies[parent] = kept
+
+        for field in ("comments_text", "comment_likes", "comment_dates", "comment_ids", "comment_authors",
+                      "comment_replies", "comment_profile_images", "comment_profile_image_hashes"):
+            if comments.get(field) is not None and len(comments[field]) == len(mask):
+                comments[field] = [value for value, keep in zip(comments[field], mask) if keep]
+
+        # parent_index apunta a la posición del padre en las listas ya filtradas
+        if comments.get("comment_replies") is not None:
+            comments["comment_replies"] = [
+                [{**r, "parent_index": parent} for r in thread]
+                for parent, thread in enumerate(comments["comment_replies"])
+            ]
+            comments["replies_to_known_comments"] = known_parent_replies
+            comments["replies_count"] = (
+                sum(len(r) for r in comments["comment_replies"]) + len(known_parent_replies)
+            )
+
+        comments["comments_length"] = len(comments["comments_text"])
+        comments["duplicates_skipped"] = duplicates
+        logger.log(f"[URL {index+1}] Dedupe: {comments['comments_length']} new comments, "
+                   f"{len(known_parent_replies)} new replies to known comments, {duplicates} duplicates skipped.")
+
+
+    async def _finish_job(self, scheduler, job, is_retry, result, started, on_result):
+        result["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        if await scheduler.done(job, is_retry, result) and on_result:
+            await on_result(job, result)
+
+
+    async def _join_job(self, scheduler, job, is_retry, result, video_data, channel_task, started, on_result):
+        try:
+            await self._complete_url(result, video_data, channel_task, job.save)
+            await self._finish_job(scheduler, job, is_retry, result, started, on_result)
+        finally:
+            self.join_slots.release()
+
+
+    async def _worker(self, scheduler, sem, context, on_result=None):
+        """
+        Toma trabajos del JobScheduler hasta que se vacía (o indefinidamente en el daemon).
+        Los fallos transient/throttled vuelven al carril de reintentos; `on_result`
+        recibe (job, result) solo con el resultado final de cada URL.
+
+        En cuanto la página del video se cierra, la unión con la etapa de canal, los medios
+        y el guardado siguen en una tarea aparte y el worker toma el siguiente trabajo: la
+        latencia de los canales no frena a las pestañas de video. `join_slots` limita
+        cuántos resultados pueden esperar así a la vez.
+        """
+        joins = set()
+        try:
+            while True:
+                job, is_retry = await scheduler.next()
+                if job is None:
+                    break
+                if is_retry:
+                    logger.log(f"[URL {job.index+1}] Retry attempt {job.attempts}: {job.url}")
+                started = time.monotonic()
+                result, video_data, channel_task = await self._process_url(sem, context, job.url, job.index)
+                if video_data is None:
+                    await self._finish_job(scheduler, job, is_retry, result, started, on_result)
+                    continue
+                await self.join_slots.acquire()
+                task = asyncio.create_task(self._join_job(
+                    scheduler, job, is_retry, result, video_data, channel_task, started, on_result
+                ))
+                joins.add(task)
+                task.add_done_callback(joins.discard)
+        except asyncio.CancelledError:
+            for task in joins:
+                task.cancel()
+            raise
+        await asyncio.gather(*joins)
+
+
+    async def _discover(self, scheduler, expander, listings, first_index):
+        """
+        Expande los listados uno a uno y envía cada video nuevo al JobScheduler
+        (deduplicado contra las URLs directas y entre listados). Al terminar
+        cierra la cola para que los workers acaben cuando se vacíe.
+        """
+        seen = {video_id_from_url(url) for url in self.urls}
+        next_index = first_index
+        try:
+            for list_index, url in enumerate(listings):
+                async for video_url in expander.expand(url, list_index):
+                    video_id = video_id_from_url(video_url)
+                    if video_id in seen:
+                        continue
+                    seen.add(video_id)
+                    await scheduler.submit(Job(video_url, next_index))
+                    next_index += 1
+        finally:
+            await scheduler.close()
+            logger.log(f"[RUN] Discovery finished: {next_index - first_index} videos queued "
+                       f"from {len(listings)} listings.")
+
 
     async def _run(self):
         """
-        Método interno que orquesta el scraping de todas las URLs:
+        Método interno que ejecuta el scraping, envuelto por el perfilador si `--profile` está activo.
+        """
+        if self.profiler:
+            self.profiler.start()
+        try:
+            await self._run_jobs()
+        finally:
+            if self.profiler:
+                self.profiler.stop()
+
+
+    async def _run_jobs(self):
+        """
+        Orquesta el scraping de todas las URLs:
         - Crea un semáforo para limitar concurrencia.
         - Abre un navegador con BrowserManager.
-        - Lanza tareas en paralelo para procesar todas las URLs.
-        - Al final, guarda los resultados en un archivo JSON.
+        - Lanza `max_concurrent` workers sobre un JobScheduler (carril nuevo + carril de reintentos).
+        - Las URLs de canal/playlist/búsqueda se expanden en paralelo con el scraping:
+          cada video descubierto (sin repetir) entra a la cola en cuanto aparece.
+        - Al final, registra el resumen y guarda el informe de fallos en JSON.
         """
         sem = asyncio.Semaphore(self.max_concurrent)
+        scheduler = JobScheduler(self.max_concurrent, policy=self.retry_policy)
+
+        videos = [url for url in self.urls if classify_url(url) == VIDEO]
+        listings = [url for url in self.urls if classify_url(url) != VIDEO]
+
+        # Orden LPT según el historial: los videos con más comentarios empiezan primero
+        history = ScrapeHistory(self.output_dir)
+        jobs = [Job(url, i) for i, url in enumerate(videos)]
+        estimates = estimate_all(videos, history)
+        input_makespan = simulate_makespan(estimates, self.max_concurrent)
+        if self.order == "longest-first":
+            jobs, estimates = longest_first(jobs, estimates)
+        estimated_makespan = simulate_makespan(estimates, self.max_concurrent)
+        logger.log(f"[RUN] Order: {self.order}. Estimated makespan {estimated_makespan:.0f}s "
+                   f"(input order {input_makespan:.0f}s) over {self.max_concurrent} tabs.")
+
+        for job in jobs:
+            await scheduler.submit(job)
+        if not listings:
+            await scheduler.close()
+
+        results = []
+
+        async def collect(job, result):
+            results.append(result)
 
         # Abrimos navegador con el contexto de BrowserManager
-        async with BrowserManager(headless=self.headless) as context:
-            tasks = [
-                self._process_url(sem, context, url, i)
-                for i, url in enumerate(self.urls)
+        manager = self.browser_manager()
+        async with manager as context:
+            if self.prewarm_urls:
+                await manager.prewarm(self.prewarm_urls, traffic=self.traffic)
+
+            self.channel_stage = ChannelStage(self, context, max_concurrent=self.max_concurrent_channels)
+            self.watchdog.start()
+            if self.media:
+                self.media.attach(context.request)
+            expander = ListingExpander(self, context, max_videos=self.max_videos_per_listing)
+            started = time.monotonic()
+            workers = [
+                self._worker(scheduler, sem, context, on_result=collect)
+                for _ in range(self.max_concurrent)
             ]
-            await asyncio.gather(*tasks)
+            if listings:
+                workers.append(self._discover(scheduler, expander, listings, len(videos)))
+            await asyncio.gather(*workers)
+            await self.channel_stage.close()
+            await self.watchdog.stop()
+            actual_makespan = time.monotonic() - started
+
+        for result in results:
+            if result["status"] == "ok":
+                history.record(result["url"], result.get("comments_count"), result.get("elapsed_seconds"))
+        history.save()
+        if self.dedupe:
+            self.dedupe.close()
+        if self.media:
+            self.media.close()
+        self.catalog.close()
+
+        logger.log(f"[RUN] Makespan: estimated {estimated_makespan:.0f}s, actual {actual_makespan:.0f}s.")
+        logger.log(f"[RUN] Pacing: {self.pacer.status()}")
+        logger.log(f"[RUN] Channel stage: {self.channel_stage.status()}")
+        logger.log(f"[RUN] Watchdog: {self.watchdog.status()}")
+        if self.media:
+            logger.log(f"[RUN] Media: {self.media.status()}")
+        if self.traffic:
+            logger.log(f"[RUN] Traffic over {self.traffic.pages} pages: {self.traffic.total.summary()}")
+
+        report = scheduler.failure_report()
+        logger.log(f"[RUN] Completed: {report['completed']}, failed: {report['failed']} {report['failed_by_class']}")
+        if report["failures"]:
+            file_path = save_json(report, filename="failure_report", folder=self.output_dir)
+            logger.log(f"[RUN] Failure report saved in: {file_path}")
 
 
 #RUN
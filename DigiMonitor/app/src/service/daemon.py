@@ -0,0 +1,373 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from DigiMonitor.app.src.utils import logger
+from DigiMonitor.app.src.scheduler.jobs import Job, JobScheduler
+from DigiMonitor.app.src.scraper.channel import ChannelStage
+from DigiMonitor.app.src.utils.urls import VIDEO, classify_url
+
+
+MAX_REQUEST_BODY = 1024 * 1024  # Bytes máximos del cuerpo de una petición (1 MiB)
+MAX_REQUEST_HEADERS = 100
+
+
+class RequestTooLarge(ValueError):
+    """
+    El cuerpo de la petición supera MAX_REQUEST_BODY (se responde 413).
+    """
+
+
+class DaemonJob:
+    """
+    Trabajo enviado al daemon: un lote de URLs y sus resultados.
+
+    - sink = "file"   → cada URL se guarda en `output_dir` (igual que el CLI).
+    - sink = "stream" → los datos se devuelven en el resultado y no se escriben a disco.
+    """
+
+    def __init__(self, job_id, urls, sink):
+        self.id = job_id
+        self.urls = urls
+        self.sink = sink
+        self.results = []
+        self.created = time.time()
+        self.finished = None
+        self.changed = asyncio.Condition()  # Notifica a los clientes en /stream
+
+    @property
+    def status(self) -> str:
+        if len(self.results) == len(self.urls):
+            return "done"
+        return "running" if self.results else "queued"
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "sink": self.sink,
+            "total": len(self.urls),
+            "completed": len(self.results),
+            "failed": sum(1 for r in self.results if r["status"] != "ok"),
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class ScraperDaemon:
+    """
+    Mantiene un navegador "caliente" (BrowserManager abierto) y acepta trabajos
+    a través de una pequeña API HTTP local (TCP o socket Unix).
+
+    Endpoints:
+    - POST /jobs              {"urls": [...], "sink": "file" | "stream"} → {"id": ...}
+                              (solo URLs de video: canales, playlists y búsquedas → 400)
+    - GET  /jobs/<id>         estado y resultados del trabajo.
+    - GET  /jobs/<id>/stream  resultados en NDJSON a medida que terminan (chunked).
+    - GET  /status            profundidad de la cola, páginas activas y trabajos.
+
+    Evita pagar en cada lote el arranque de Python, del driver de Playwright
+    y de Chromium, además de conservar las cachés del navegador.
+
+    Memoria acotada: los trabajos terminados se descartan pasados `job_ttl` segundos o
+    al superar `max_finished_jobs`, y con sink "stream" los datos de cada resultado se
+    liberan en cuanto se envían por /stream.
+    """
+
+    def __init__(self, scraper, host="127.0.0.1", port=8765, socket_path=None, channel_ttl=3600,
+                 job_ttl=3600, max_finished_jobs=1000):
+        """
+        Parámetros:
+        - scraper (YTScraper): instancia configurada que procesa cada URL.
+        - host (str), port (int): dirección TCP de escucha (solo localhost por defecto).
+        - socket_path (str): si se indica, escucha en un socket Unix en lugar de TCP.
+        - channel_ttl (float): segundos durante los que se reutilizan los metadatos de un canal.
+        - job_ttl (float): segundos que se conserva un trabajo terminado para consultarlo.
+        - max_finished_jobs (int): trabajos terminados que se conservan como máximo.
+        """
+        self.scraper = scraper
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.channel_ttl = channel_ttl
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.scheduler = None  # JobScheduler (se crea dentro del event loop en _run)
+        self.jobs = {}
+        self.started = time.time()
+        self._job_ids = itertools.count(1)
+        self._url_index = itertools.count(0)  # Índice global de URL (para logs y nombres de archivo)
+
+
+#WORKERS
+    async def _on_result(self, job, result):
+        """
+        Recibe el resultado final de una URL (tras los reintentos) y lo publica en su trabajo.
+        """
+        daemon_job = job.owner
+        async with daemon_job.changed:
+            daemon_job.results.append(result)
+            if daemon_job.status == "done":
+                daemon_job.finished = time.time()
+                logger.log(f"[DAEMON] Job {daemon_job.id} finished ({len(daemon_job.results)} URLs).")
+            daemon_job.changed.notify_all()
+
+
+    def _evict(self):
+        """
+        Descarta los trabajos terminados que vencieron su TTL o exceden el máximo (los más antiguos).
+        """
+        now = time.time()
+        finished = sorted(
+            (job for job in self.jobs.values() if job.finished is not None), key=lambda job: job.finished
+        )
+        excess = len(finished) - self.max_finished_jobs
+        for position, job in enumerate(finished):
+            if position < excess or now - job.finished > self.job_ttl:
+                del self.jobs[job.id]
+
+
+    async def submit(self, urls, sink="file") -> DaemonJob:
+        """
+        Registra un trabajo nuevo y encola sus URLs.
+        """
+        self._evict()
+        daemon_job = DaemonJob(str(next(self._job_ids)), urls, sink)
+        self.jobs[daemon_job.id] = daemon_job
+        for url in urls:
+            await self.scheduler.submit(
+                Job(url, next(self._url_index), save=(sink == "file"), owner=daemon_job)
+            )
+        logger.log(f"[DAEMON] Job {daemon_job.id} queued with {len(urls)} URLs.")
+        return daemon_job
+
+
+    def status(self) -> dict:
+        self._evict()
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "queue_depth": self.scheduler.depth(),
+            "active_pages": self.scraper.active_pages,
+            "channel_stage": self.scraper.channel_stage.status() if self.scraper.channel_stage else None,
+            "max_concurrent": self.scraper.max_concurrent,
+            "pacing": self.scraper.pacer.status(),
+            "traffic": self.scraper.traffic.total.as_dict() if self.scraper.traffic else None,
+            "media": self.scraper.media.status() if self.scraper.media else None,
+            "watchdog": self.scraper.watchdog.status(),
+            "jobs": [job.summary() for job in self.jobs.values() if job.status != "done"],
+            "jobs_total": len(self.jobs),
+        }
+
+
+#HTTP
+    async def _read_request(self, reader):
+        """
+        Lee una petición HTTP/1.1 mínima: línea de petición, cabeceras y cuerpo (Content-Length).
+        """
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            return None
+        method, path, _ = request_line.split(" ", 2)
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            if len(headers) >= MAX_REQUEST_HEADERS:
+                raise ValueError("Too many headers")
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length < 0:
+            raise ValueError(f"Invalid Content-Length: {length}")
+        if length > MAX_REQUEST_BODY:
+            raise RequestTooLarge(f"Body of {length} bytes exceeds {MAX_REQUEST_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0].rstrip("/") or "/", body
+
+
+    async def _send_json(self, writer, status, payload):
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large"}
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+
+    async def _stream_job(self, writer, job):
+        """
+        Envía los resultados del trabajo como NDJSON con codificación chunked,
+        uno por línea a medida que se completan, y cierra al terminar el trabajo.
+        Una vez enviado, el documento ("data") se libera: /jobs/<id> solo conserva el resumen.
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.results) > sent or job.status == "done")
+                pending = job.results[sent:]
+                done = job.status == "done"
+            for result in pending:
+                line = json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n"
+                writer.write(f"{len(line):X}\r\n".encode("latin-1") + line + b"\r\n")
+            sent += len(pending)
+            await writer.drain()
+            for result in pending:
+                if result.pop("data", None) is not None:
+                    result["data_streamed"] = True
+            if done and sent == len(job.results):
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+    async def _handle(self, reader, writer):
+        """
+        Atiende una conexión: enruta la petición al endpoint correspondiente.
+        """
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, body = request
+            parts = path.strip("/").split("/")
+
+            if path == "/status" and method == "GET":
+                await self._send_json(writer, 200, self.status())
+
+            elif path == "/jobs" and method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    payload = None
+                if not isinstance(payload, dict) or not isinstance(payload.get("urls", []), list):
+                    await self._send_json(writer, 400, {"error": "Body must be a JSON object with a 'urls' list."})
+                    return
+                urls = [u.strip() for u in payload.get("urls", []) if isinstance(u, str) and u.strip()]
+                sink = payload.get("sink", "file")
+                if not urls or sink not in ("file", "stream"):
+                    await self._send_json(writer, 400, {"error": "Expected non-empty 'urls' and sink 'file' or 'stream'."})
+                    return
+                listings = [url for url in urls if classify_url(url) != VIDEO]
+                if listings:
+                    await self._send_json(writer, 400, {
+                        "error": "The daemon only accepts video URLs (channel, playlist and search URLs are CLI-only).",
+                        "rejected": listings,
+                    })
+                    return
+                job = await self.submit(urls, sink)
+                await self._send_json(writer, 202, job.summary())
+
+            elif len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+                job = self.jobs.get(parts[1])
+                if job is None:
+                    await self._send_json(writer, 404, {"error": f"Job '{parts[1]}' not found."})
+                elif len(parts) == 3 and parts[2] == "stream":
+                    await self._stream_job(writer, job)
+                elif len(parts) == 2:
+                    await self._send_json(writer, 200, {**job.summary(), "results": job.results})
+                else:
+                    await self._send_json(writer, 404, {"error": "Unknown endpoint."})
+
+            else:
+                await self._send_json(writer, 404, {"error": "Unknown endpoint."})
+
+        except RequestTooLarge as error:
+            logger.log(f"[DAEMON] [WARNING] Bad request: {error}", "warning")
+            await self._send_json(writer, 413, {"error": str(error)})
+
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as error:
+            logger.log(f"[DAEMON] [WARNING] Bad request: {error}", "warning")
+        finally:
+            writer.close()
+
+
+#RUN
+    async def _run(self):
+        """
+        Abre el navegador una sola vez, lanza `max_concurrent` workers y
+        sirve la API hasta que el proceso se detenga.
+        """
+        if self.scraper.profiler:
+            self.scraper.profiler.start()
+        sem = asyncio.Semaphore(self.scraper.max_concurrent)
+        self.scheduler = JobScheduler(self.scraper.max_concurrent, policy=self.scraper.retry_policy, keep_failures=False)
+
+        manager = self.scraper.browser_manager()
+        async with manager as context:
+            if self.scraper.prewarm_urls:
+                await manager.prewarm(self.scraper.prewarm_urls, traffic=self.scraper.traffic)
+            self.scraper.channel_stage = ChannelStage(
+                self.scraper, context, max_concurrent=self.scraper.max_concurrent_channels, ttl=self.channel_ttl
+            )
+            if self.scraper.media:
+                self.scraper.media.attach(context.request)
+            self.scraper.watchdog.start()
+            workers = [
+                asyncio.create_task(self.scraper._worker(self.scheduler, sem, context, on_result=self._on_result))
+                for _ in range(self.scraper.max_concurrent)
+            ]
+            if self.socket_path:
+                server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+                logger.log(f"[DAEMON] Listening on unix socket {self.socket_path}")
+            else:
+                server = await asyncio.start_server(self._handle, host=self.host, port=self.port)
+                logger.log(f"[DAEMON] Listening on http://{self.host}:{self.port}")
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                await self.scraper.watchdog.stop()
+                if self.scraper.dedupe:
+                    self.scraper.dedupe.close()
+                if self.scraper.media:
+                    self.scraper.media.close()
+                self.scraper.catalog.close()
+                if self.scraper.profiler:
+                    self.scraper.profiler.stop()
+                if self.socket_path and os.path.exists(self.socket_path):
+                    os.remove(self.socket_path)
+
+
+    def run(self):
+        """
+        Ejecuta el daemon de forma síncrona hasta recibir Ctrl+C / SIGINT.
+        """
+        try:
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            logger.log("[DAEMON] Stopped.")
@@ -0,0 +1,136 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import sqlite3
+import zipfile
+from datetime import datetime, timedelta
+from DigiMonitor.app.src.utils import logger
+
+
+CATALOG_FILE = "catalog.sqlite"
+ARCHIVE_DIR = "archives"
+
+
+class Catalog:
+    """
+    Catálogo SQLite de los archivos de salida: (video_id, channel_id, fecha de scraping)
+    → ubicación del JSON (ruta, o archivo ZIP + miembro tras la compactación).
+
+    Los índices por (video_id, scraped_at) y (channel_id, scraped_at) hacen que
+    "el último scraping de un video" sea una búsqueda O(log n) en lugar de listar
+    y abrir miles de archivos.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.db = sqlite3.connect(os.path.join(folder, CATALOG_FILE))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS outputs (
+                id INTEGER PRIMARY KEY,
+                video_id TEXT,
+                channel_id TEXT,
+                url TEXT,
+                scraped_at TEXT NOT NULL,
+                path TEXT NOT NULL,
+                archive TEXT,
+                member TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_outputs_video ON outputs (video_id, scraped_at);
+            CREATE INDEX IF NOT EXISTS idx_outputs_channel ON outputs (channel_id, scraped_at);
+            CREATE INDEX IF NOT EXISTS idx_outputs_scraped ON outputs (scraped_at) WHERE archive IS NULL;
+        """)
+
+
+    def add(self, video_id, channel_id, url, path, scraped_at=None):
+        """
+        Registra un archivo de salida. `path` se guarda relativo a la carpeta del catálogo.
+        """
+        scraped_at = scraped_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.db:
+            self.db.execute(
+                "INSERT INTO outputs (video_id, channel_id, url, scraped_at, path) VALUES (?, ?, ?, ?, ?)",
+                (video_id, channel_id, url, scraped_at, os.path.relpath(path, self.folder))
+            )
+
+
+    def latest(self, video_id) -> dict | None:
+        row = self.db.execute(
+            "SELECT * FROM outputs WHERE video_id = ? ORDER BY scraped_at DESC, id DESC LIMIT 1", (video_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+    def compact(self, older_than_days) -> int:
+        """
+        Empaqueta los JSON sueltos con más de `older_than_days` días en archivos ZIP
+        mensuales (`archives/AAAA-MM.zip`), actualiza el catálogo y borra los originales.
+        Retorna el número de archivos compactados.
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+        rows = self.db.execute(
+            "SELECT id, path, scraped_at FROM outputs WHERE archive IS NULL AND scraped_at < ? ORDER BY scraped_at",
+            (cutoff,)
+        ).fetchall()
+
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(row["scraped_at"][:7], []).append(row)
+
+        os.makedirs(os.path.join(self.folder, ARCHIVE_DIR), exist_ok=True)
+        compacted = 0
+        for month, entries in by_month.items():
+            archive_rel = os.path.join(ARCHIVE_DIR, f"{month}.zip")
+            archive_path = os.path.join(self.folder, archive_rel)
+            temp_path = archive_path + ".tmp"
+
+            # 1. Escribir una copia completa del archivo mensual (el original queda intacto)
+            if os.path.exists(archive_path):
+                shutil.copyfile(archive_path, temp_path)
+            packed = []  # (id, member, source)
+            with zipfile.ZipFile(temp_path, "a", zipfile.ZIP_DEFLATED) as archive:
+                members = set(archive.namelist())
+                for entry in entries:
+                    source = os.path.join(self.folder, entry["path"])
+                    if not os.path.exists(source):
+                        logger.log(f"[CATALOG] [WARNING] Missing file, skipped: {entry['path']}", "warning")
+                        continue
+                    member = entry["path"].replace(os.sep, "/")
+                    if member not in members:
+                        archive.write(source, member)
+                    packed.append((entry["id"], member, source))
+
+            # 2. Reemplazo atómico: una caída antes de este punto solo deja un .tmp
+            os.replace(temp_path, archive_path)
+
+            # 3. Catálogo en una sola transacción; 4. solo entonces se borran los originales
+            with self.db:
+                self.db.executemany("UPDATE outputs SET archive = ?, member = ? WHERE id = ?",
+                                    [(archive_rel, member, entry_id) for entry_id, member, _ in packed])
+            for _, _, source in packed:
+                os.remove(source)
+            compacted += len(packed)
+            logger.log(f"[CATALOG] {month}: {len(packed)} files packed into {archive_rel}")
+        return compacted
+
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,164 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import unicodedata
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom en un archivo mapeado en memoria (mmap).
+
+    El tamaño se fija al crearlo a partir de la capacidad y la tasa de falsos positivos
+    (~1.2 bytes por elemento al 1 %), así la memoria queda acotada sin importar
+    cuántos comentarios se hayan visto. Las k posiciones salen de un solo hash de
+    64 bits mediante doble hashing (Kirsch–Mitzenmacher).
+    """
+
+    MAGIC = b"DGBLOOM1"
+    HEADER = struct.Struct("<8sQI")  # magic, bits (m), hashes (k)
+
+    def __init__(self, path, capacity, error_rate):
+        if not os.path.exists(path):
+            bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            bits = (bits + 7) // 8 * 8
+            hashes = max(1, round(bits / capacity * math.log(2)))
+            with open(path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, bits, hashes))
+                f.truncate(self.HEADER.size + bits // 8)
+
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a DigiBook bloom filter: {path}")
+
+
+    def _positions(self, key):
+        key &= 0xFFFFFFFFFFFFFFFF
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+
+    def add(self, key):
+        for pos in self._positions(key):
+            offset = self.HEADER.size + (pos >> 3)
+            self._map[offset] |= 1 << (pos & 7)
+
+
+    def __contains__(self, key):
+        return all(
+            self._map[self.HEADER.size + (pos >> 3)] & (1 << (pos & 7))
+            for pos in self._positions(key)
+        )
+
+
+    def flush(self):
+        self._map.flush()
+
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class DedupeIndex:
+    """
+    Índice persistente de comentarios ya escritos, compartido entre ejecuciones.
+
+    - BloomFilter (mmap): responde "seguro que es nuevo" sin tocar disco en la mayoría de los casos.
+    - SQLite (tabla de enteros de 64 bits, WITHOUT ROWID): conjunto exacto que confirma
+      los positivos del filtro. Escala a cientos de millones de claves con caché acotada.
+
+    Uso: `filter_new()` marca qué comentarios son nuevos y deja sus claves pendientes;
+    `commit()` las confirma solo después de guardar el archivo, así un fallo no pierde comentarios.
+    """
+
+    def __init__(self, folder, capacity=10_000_000, error_rate=0.01, cache_mb=16):
+        os.makedirs(folder, exist_ok=True)
+        self.bloom = BloomFilter(os.path.join(folder, "bloom.bin"), capacity, error_rate)
+        self.db = sqlite3.connect(os.path.join(folder, "seen.sqlite"))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(f"PRAGMA cache_size=-{int(cache_mb * 1024)}")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._pending = []
+
+
+    @staticmethod
+    def key(comment_id=None, author=None, text=None, video_id=None) -> int:
+        """
+        Clave de 64 bits: por ID de comentario si existe; si no, por el hash del
+        (autor, texto normalizado, video).
+        """
+        if comment_id:
+            raw = f"id:{comment_id}"
+        else:
+            normalized = " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+            raw = f"h:{video_id}\x1f{(author or '').strip().casefold()}\x1f{normalized}"
+        digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+        return struct.unpack("<q", digest)[0]
+
+
+    def _seen(self, key) -> bool:
+        if key not in self.bloom:
+            return False
+        return self.db.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+
+    def filter_new(self, keys) -> list[bool]:
+        """
+        Devuelve, para cada clave, True si el comentario no se ha escrito nunca
+        (los duplicados dentro de la misma lista cuentan como vistos).
+        """
+        batch = set()
+        mask = []
+        for key in keys:
+            new = key not in batch and not self._seen(key)
+            batch.add(key)
+            mask.append(new)
+            if new:
+                self._pending.append(key)
+        return mask
+
+
+    def commit(self):
+        if not self._pending:
+            return
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO seen (key) VALUES (?)", ((k,) for k in self._pending))
+        for key in self._pending:
+            self.bloom.add(key)
+        self.bloom.flush()
+        self._pending = []
+
+
+    def rollback(self):
+        self._pending = []
+
+
+    def close(self):
+        self.commit()
+        self.db.close()
+        self.bloom.close()
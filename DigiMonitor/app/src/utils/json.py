@@ -16,12 +16,13 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import hashlib
 import json
 import os
 from datetime import datetime
 
 
-def save_json(data: dict, filename: str, folder: str):
+def save_json(data: dict, filename: str, folder: str, shard_key: str | None = None):
     """
     Guarda un diccionario de Python como archivo JSON en disco.
 
@@ -30,6 +31,9 @@ def save_json(data: dict, filename: str, folder: str):
     - filename (str): nombre base del archivo (sin extensión).
     - folder (str): carpeta de destino donde se guardará el archivo.
                     Por defecto es "output".
+    - shard_key (str): si se indica (p. ej. el ID del video), el archivo va a una
+                       subcarpeta por hash `folder/ab/cd/` para no acumular miles de
+                       archivos en un solo directorio.
 
     Funcionamiento:
     1. Crea la carpeta de destino si no existe.
@@ -42,6 +46,12 @@ def save_json(data: dict, filename: str, folder: str):
     # Ejemplo: 20250820_174530
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    # Carpeta por hash: sha1("VIDEO_ID") = "ab12..." → folder/ab/12/
+    if shard_key:
+        digest = hashlib.sha1(shard_key.encode("utf-8")).hexdigest()
+        folder = os.path.join(folder, digest[:2], digest[2:4])
+        os.makedirs(folder, exist_ok=True)
+
     # Ruta completa del archivo → carpeta + nombre base + timestamp + extensión
     full_path = os.path.join(folder, f"{filename}_{timestamp}.json")
 
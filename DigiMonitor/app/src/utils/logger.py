@@ -23,18 +23,32 @@ import os
 # Carpeta donde se guardarán los logs
 LOG_DIR = "DigiMonitor/logs"
 
-# Crea la carpeta "logs" si no existe (evita errores al escribir archivos de log)
-os.makedirs(LOG_DIR, exist_ok=True)
+# Se configura en el primer uso (no al importar el módulo), así `--help`,
+# `--version` o un error de argumentos no crean carpetas ni archivos.
+_configured = False
 
-# Configuración básica de logging
-# - filename: ruta del archivo donde se guardan los logs
-# - level: nivel mínimo de logs que se registran (INFO = muestra INFO, WARNING, ERROR, CRITICAL)
-# - format: formato del mensaje de log (fecha/hora, nivel y mensaje)
-logging.basicConfig(
-    filename=os.path.join(LOG_DIR, "scraper.log"),
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
+
+def setup():
+    """
+    Configura el logging hacia "logs/scraper.log" (una sola vez).
+
+    Funcionamiento:
+    1. Crea la carpeta "logs" si no existe (evita errores al escribir archivos de log).
+    2. Configuración básica de logging:
+       - filename: ruta del archivo donde se guardan los logs
+       - level: nivel mínimo de logs que se registran (INFO = muestra INFO, WARNING, ERROR, CRITICAL)
+       - format: formato del mensaje de log (fecha/hora, nivel y mensaje)
+    """
+    global _configured
+    if _configured:
+        return
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logging.basicConfig(
+        filename=os.path.join(LOG_DIR, "scraper.log"),
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+    _configured = True
 
 
 def log(msg: str, level="info"):
@@ -52,5 +66,6 @@ def log(msg: str, level="info"):
     3. Guarda el mensaje en el archivo "logs/scraper.log".
     4. Imprime el mensaje en consola (para visibilidad inmediata).
     """
+    setup()
     getattr(logging, level.lower(), logging.info)(msg)
     print(msg)
@@ -0,0 +1,182 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from DigiMonitor.app.src.utils import logger
+
+
+MEDIA_INDEX_FILE = "media.sqlite"
+BLOB_DIR = "blobs"
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/avif": ".avif",
+}
+
+
+class MediaStore:
+    """
+    Almacén de medios direccionado por contenido (miniaturas y avatares).
+
+    - Cada archivo se guarda una sola vez como `blobs/ab/<sha256><ext>`: dos URLs con
+      los mismos bytes (p. ej. el mismo avatar en otro tamaño de URL) comparten el blob.
+    - `media.sqlite` guarda URL → hash: una URL ya descargada no vuelve a pedirse,
+      ni en esta ejecución ni en las siguientes.
+    - Las descargas pasan por un cliente HTTP asíncrono con pool de conexiones
+      (APIRequestContext de Playwright, o cualquier objeto con el mismo `get`)
+      limitado por un semáforo. Las peticiones simultáneas a la misma URL se comparten.
+    """
+
+    def __init__(self, folder, max_concurrent=8, timeout=30):
+        """
+        Parámetros:
+        - folder (str): carpeta del almacén (blobs + índice).
+        - max_concurrent (int): descargas simultáneas.
+        - timeout (float): segundos máximos por descarga.
+        """
+        self.folder = folder
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.client = None
+        self._sem = None
+        self._inflight = {}
+        self.stats = {"downloaded": 0, "cache_hits": 0, "shared_blobs": 0, "failed": 0, "bytes": 0}
+
+        os.makedirs(os.path.join(folder, BLOB_DIR), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(folder, MEDIA_INDEX_FILE))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS media (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                content_type TEXT,
+                size INTEGER,
+                fetched_at REAL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS media_hash ON media (hash)")
+        self.db.commit()
+
+
+    def attach(self, client):
+        """
+        Asocia el cliente HTTP (p. ej. `context.request` del navegador, que comparte
+        cookies y pool de conexiones). Se llama dentro del event loop.
+        """
+        self.client = client
+        self._sem = asyncio.Semaphore(self.max_concurrent)
+
+
+    def lookup(self, url) -> str | None:
+        row = self.db.execute("SELECT hash FROM media WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+
+    def blob_path(self, digest, content_type) -> str:
+        """
+        Ruta esperada del blob: `blobs/<hash[:2]>/<hash><ext>`.
+        """
+        return os.path.join(self.folder, BLOB_DIR, digest[:2], digest + EXTENSIONS.get(content_type, ""))
+
+
+    def path(self, digest) -> str | None:
+        """
+        Ruta local del blob con ese hash (None si no existe).
+        Se resuelve con el índice (hash → content_type) y un solo stat, sin listar el shard.
+        """
+        row = self.db.execute("SELECT content_type FROM media WHERE hash = ? LIMIT 1", (digest,)).fetchone()
+        if row is None:
+            return None
+        target = self.blob_path(digest, row[0])
+        return target if os.path.exists(target) else None
+
+
+    async def fetch(self, url) -> str | None:
+        """
+        Retorna el hash sha256 del contenido de `url`, descargándolo solo si no está en caché.
+        None si la URL no es descargable o la descarga falla.
+        """
+        if not url or not url.startswith(("http://", "https://")):
+            return None
+        digest = self.lookup(url)
+        if digest:
+            self.stats["cache_hits"] += 1
+            return digest
+        task = self._inflight.get(url)
+        if task is None:
+            task = self._inflight[url] = asyncio.ensure_future(self._download(url))
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+
+    async def fetch_all(self, urls) -> list[str | None]:
+        """
+        Descarga varias URLs en paralelo (respetando el límite) conservando el orden.
+        """
+        if urls is None:
+            return None
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+
+    async def _download(self, url) -> str | None:
+        async with self._sem:
+            try:
+                response = await self.client.get(url, timeout=self.timeout * 1000)
+                if not response.ok:
+                    raise RuntimeError(f"HTTP {response.status}")
+                body = await response.body()
+                content_type = response.headers.get("content-type", "").split(";")[0].strip()
+            except Exception as error:
+                self.stats["failed"] += 1
+                logger.log(f"[MEDIA] [WARNING] Download failed for {url}: {error}", "warning")
+                return None
+
+        digest = hashlib.sha256(body).hexdigest()
+        target = self.blob_path(digest, content_type)
+        if os.path.exists(target) or self.path(digest):
+            self.stats["shared_blobs"] += 1
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            temp = target + ".part"
+            with open(temp, "wb") as f:
+                f.write(body)
+            os.replace(temp, target)
+            self.stats["bytes"] += len(body)
+        self.stats["downloaded"] += 1
+
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO media (url, hash, content_type, size, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, content_type, len(body), time.time())
+            )
+        return digest
+
+
+    def status(self) -> dict:
+        return {**self.stats, "inflight": len(self._inflight)}
+
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,163 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import cProfile
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+from DigiMonitor.app.src.utils import logger
+
+
+class LoopLagMonitor:
+    """
+    Detecta bloqueos del event loop de asyncio (time.sleep, parsing síncrono,
+    escritura de archivos, ...), que detienen todas las pestañas a la vez.
+
+    - Un "latido" dentro del loop actualiza una marca de tiempo cada `interval` segundos.
+    - Un hilo vigilante comprueba la marca: si el latido lleva más de `threshold`
+      segundos sin actualizarse, captura la pila del hilo del loop (la función culpable)
+      y la registra una sola vez por bloqueo.
+    - Opcionalmente muestrea la pila del loop cada `sample_interval` segundos y la
+      guarda en formato "folded" (una línea `frame;frame;frame N`), listo para
+      flamegraph.pl, speedscope o inferno.
+    """
+
+    def __init__(self, threshold=0.1, interval=0.02, sample_interval=None):
+        self.threshold = threshold
+        self.interval = interval
+        self.sample_interval = sample_interval
+        self.stalls = []            # [{"duration", "stack"}]
+        self.samples = Counter()    # pila plegada → número de muestras
+        self._beat = time.monotonic()
+        self._loop_thread = None
+        self._stop = threading.Event()
+        self._task = None
+        self._watcher = None
+
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+
+    def _stack(self):
+        frame = sys._current_frames().get(self._loop_thread)
+        return traceback.extract_stack(frame) if frame else []
+
+
+    def _watch(self):
+        stalled_since = None
+        stall_stack = None
+        next_sample = time.monotonic()
+        tick = min(self.interval, self.sample_interval or self.interval)
+        while not self._stop.wait(tick):
+            now = time.monotonic()
+            lag = now - self._beat
+
+            if lag > self.threshold:
+                if stalled_since is None:
+                    stalled_since = self._beat
+                    stall_stack = self._stack()
+            elif stalled_since is not None:
+                duration = self._beat - stalled_since
+                self.stalls.append({"duration": duration, "stack": stall_stack})
+                culprit = "".join(traceback.format_list(stall_stack[-6:])).rstrip()
+                logger.log(f"[PROFILE] Event loop stalled {duration * 1000:.0f} ms in:\n{culprit}", "warning")
+                stalled_since = None
+
+            if self.sample_interval and now >= next_sample:
+                next_sample = now + self.sample_interval
+                stack = self._stack()
+                if stack:
+                    self.samples[";".join(f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})" for f in stack)] += 1
+
+
+    def start(self):
+        """
+        Debe llamarse desde dentro del event loop.
+        """
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watcher = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._watcher.start()
+
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join()
+        if self._task:
+            self._task.cancel()
+
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+    def summary(self) -> str:
+        if not self.stalls:
+            return f"no stalls above {self.threshold * 1000:.0f} ms"
+        worst = max(s["duration"] for s in self.stalls)
+        total = sum(s["duration"] for s in self.stalls)
+        return f"{len(self.stalls)} stalls, worst {worst * 1000:.0f} ms, total {total:.2f} s"
+
+
+class RunProfiler:
+    """
+    Agrupa las herramientas de `--profile` para una ejecución:
+    LoopLagMonitor (siempre), cProfile (opcional, `.prof` para snakeviz/pstats)
+    y el muestreo de pilas en formato folded (`.folded` para flame graphs).
+    """
+
+    def __init__(self, output_dir, threshold=0.1, cprofile=False, sample_interval=0.01):
+        self.output_dir = output_dir
+        self.monitor = LoopLagMonitor(threshold=threshold, sample_interval=sample_interval)
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+    def start(self):
+        self.monitor.start()
+        if self.cprofile:
+            self.cprofile.enable()
+
+
+    def stop(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        self.monitor.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        logger.log(f"[PROFILE] Event loop: {self.monitor.summary()}")
+        if self.monitor.samples:
+            folded = os.path.join(self.output_dir, f"profile_{self.stamp}.folded")
+            self.monitor.write_folded(folded)
+            logger.log(f"[PROFILE] Flame graph stacks saved in: {folded}")
+        if self.cprofile:
+            prof = os.path.join(self.output_dir, f"profile_{self.stamp}.prof")
+            self.cprofile.dump_stats(prof)
+            logger.log(f"[PROFILE] cProfile stats saved in: {prof}")
@@ -0,0 +1,256 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import os
+import re
+from datetime import datetime
+from DigiMonitor.app.src.utils.urls import channel_key
+
+try:
+    import fcntl  # Bloqueo de archivos (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+SERIES_DIR = "timeseries"
+MAGIC = b"DGTS1"
+
+# Columnas (contadores enteros) de cada tipo de serie
+COLUMNS = {
+    "video": ("views", "likes", "comments"),
+    "channel": ("subscribers",),
+}
+
+SAFE_KEY = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def _zigzag(n) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(z) -> int:
+    return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    """
+    Retorna (valor, nueva posición). IndexError si el varint está truncado.
+    """
+    shift = result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class SeriesStore:
+    """
+    Series de tiempo de los contadores de cada video y canal, solo de anexado.
+
+    - Un archivo por serie (`timeseries/<tipo>/<clave>.ts`): la consulta de un video
+      lee unos pocos KB en lugar de abrir cada JSON de salida.
+    - Cada instantánea se codifica como deltas respecto a la anterior (zigzag + varint):
+      marca de tiempo, una máscara de columnas presentes y el delta de cada contador.
+      Una instantánea típica ocupa ~6-10 bytes.
+    - Un archivo `.last` junto a cada serie guarda el último estado: anexar no relee la serie.
+    - El anexado bloquea el archivo (flock, en POSIX), así el CLI y el daemon pueden escribir
+      a la vez; un registro truncado por una caída se descarta en el siguiente anexado.
+    - Las series de canal usan `channel_key()` (@handle o ID UC...), no la URL del canal.
+    """
+
+    def __init__(self, folder):
+        self.folder = os.path.join(folder, SERIES_DIR)
+
+
+    def _path(self, kind, key) -> str:
+        name = key if SAFE_KEY.fullmatch(key) else hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, kind, f"{name}.ts")
+
+
+    @staticmethod
+    def _header(key) -> bytes:
+        encoded = key.encode("utf-8")
+        out = bytearray(MAGIC)
+        _write_varint(out, len(encoded))
+        return bytes(out + encoded)
+
+
+    @staticmethod
+    def _decode(data, columns):
+        """
+        Decodifica un archivo completo. Retorna (clave, filas, fin del último registro válido).
+        Cada fila es (timestamp, [valor o None por columna]).
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a DigiBook time-series file.")
+        length, pos = _read_varint(data, len(MAGIC))
+        key = data[pos:pos + length].decode("utf-8")
+        pos += length
+
+        rows = []
+        valid_end = pos
+        timestamp = 0
+        last = [0] * len(columns)
+        while pos < len(data):
+            try:
+                delta, pos = _read_varint(data, pos)
+                mask = data[pos]
+                pos += 1
+                values = []
+                for i in range(len(columns)):
+                    if mask & (1 << i):
+                        value_delta, pos = _read_varint(data, pos)
+                        last[i] += _unzigzag(value_delta)
+                        values.append(last[i])
+                    else:
+                        values.append(None)
+            except IndexError:
+                break  # Registro incompleto al final del archivo
+            timestamp += _unzigzag(delta)
+            rows.append((timestamp, values))
+            valid_end = pos
+        return key, rows, valid_end
+
+
+    @staticmethod
+    def _read_state(path, size, ncols):
+        """
+        Estado final guardado junto a la serie (`.last`): "tamaño timestamp v1 v2 ...".
+        None si falta o no corresponde al tamaño actual del archivo (p. ej. tras una caída).
+        """
+        try:
+            with open(path, encoding="ascii") as f:
+                fields = [int(x) for x in f.read().split()]
+        except (OSError, ValueError):
+            return None
+        if len(fields) != ncols + 2 or fields[0] != size:
+            return None
+        return fields[1], fields[2:]
+
+
+    @staticmethod
+    def _write_state(path, size, timestamp, last):
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="ascii") as f:
+            f.write(" ".join(str(x) for x in (size, timestamp, *last)))
+        os.replace(temp, path)
+
+
+    def append(self, kind, key, timestamp, values):
+        """
+        Anexa una instantánea. `values` es un dict columna → entero (None si no se extrajo).
+
+        El último estado (timestamp y último valor de cada columna) se lee del archivo
+        `.last`, así anexar es O(1); solo si no coincide con la serie se decodifica completa.
+        """
+        columns = COLUMNS[kind]
+        path = self._path(kind, key)
+        state_path = path[:-len(".ts")] + ".last"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    f.write(self._header(key))
+                    size = f.tell()
+                    previous_ts, last = 0, [0] * len(columns)
+                else:
+                    state = self._read_state(state_path, size, len(columns))
+                    if state is None:
+                        # Reconstrucción: decodificar la serie y descartar un registro truncado
+                        f.seek(0)
+                        _, rows, valid_end = self._decode(f.read(), columns)
+                        if valid_end < size:
+                            f.truncate(valid_end)
+                            size = valid_end
+                        previous_ts = rows[-1][0] if rows else 0
+                        last = [0] * len(columns)
+                        for _, row in rows:
+                            last = [v if v is not None else l for v, l in zip(row, last)]
+                    else:
+                        previous_ts, last = state
+
+                timestamp = int(timestamp)
+                record = bytearray()
+                _write_varint(record, _zigzag(timestamp - previous_ts))
+                mask = 0
+                deltas = bytearray()
+                for i, column in enumerate(columns):
+                    value = values.get(column)
+                    if isinstance(value, int):
+                        mask |= 1 << i
+                        _write_varint(deltas, _zigzag(value - last[i]))
+                        last[i] = value
+                record.append(mask)
+                f.write(bytes(record + deltas))
+                f.flush()
+                self._write_state(state_path, size + len(record) + len(deltas), timestamp, last)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+    def record(self, video_data, video_id):
+        """
+        Anexa los contadores de un resultado de scraping a la serie del video y a la de su canal.
+        """
+        timestamp = datetime.strptime(video_data["date_scraping"], "%Y-%m-%d %H:%M:%S").timestamp()
+        if video_id:
+            self.append("video", video_id, timestamp, {
+                "views": video_data.get("post_views_count"),
+                "likes": video_data.get("post_likes_count"),
+                "comments": video_data.get("post_comments_count"),
+            })
+        if channel_key(video_data.get("channel_id")):
+            self.append("channel", channel_key(video_data["channel_id"]), timestamp, {
+                "subscribers": video_data.get("channel_subscribers_count"),
+            })
+
+
+    def query(self, kind, key, since=None, until=None) -> list[dict]:
+        """
+        Instantáneas de una serie entre `since` y `until` (timestamps, inclusive).
+        `key` de canal: @handle, ID UC... o la URL del canal. Lista vacía si la serie no existe.
+        """
+        if kind == "channel":
+            key = channel_key(key) or ""
+        columns = COLUMNS[kind]
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            _, rows, _ = self._decode(f.read(), columns)
+        return [
+            {"timestamp": ts, "date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"),
+             **dict(zip(columns, values))}
+            for ts, values in rows
+            if (since is None or ts >= since) and (until is None or ts <= until)
+        ]
@@ -0,0 +1,127 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+def video_id_from_url(url: str) -> str | None:
+    """
+    Extrae el ID de video de una URL de YouTube.
+
+    Soporta:
+    - https://www.youtube.com/watch?v=ID
+    - https://youtu.be/ID
+    - https://www.youtube.com/live/ID y /shorts/ID
+    """
+    if not url:
+        return None
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.endswith("youtu.be"):
+        return parsed.path.strip("/").split("/")[0] or None
+    if "youtube.com" in host:
+        if parsed.path == "/watch":
+            return parse_qs(parsed.query).get("v", [None])[0]
+        parts = parsed.path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] in ("live", "shorts", "embed"):
+            return parts[1] or None
+    return None
+
+
+def comment_id_from_url(url: str) -> str | None:
+    """
+    Extrae el ID de comentario del parámetro `lc` de su enlace permanente
+    (por ejemplo "/watch?v=ID&lc=UgzX..."). Para respuestas es "padre.respuesta".
+    """
+    if not url:
+        return None
+    return parse_qs(urlparse(url).query).get("lc", [None])[0]
+
+
+VIDEO = "video"
+CHANNEL = "channel"
+PLAYLIST = "playlist"
+SEARCH = "search"
+
+CHANNEL_TABS = ("videos", "shorts", "streams")
+
+
+def watch_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def classify_url(url: str) -> str:
+    """
+    Tipo de una URL de entrada: video | channel | playlist | search.
+    Lo que no se reconoce como listado se trata como video (comportamiento anterior).
+
+    Listados soportados:
+    - https://www.youtube.com/@handle, /channel/UC..., /c/nombre, /user/nombre (y sus pestañas)
+    - https://www.youtube.com/playlist?list=ID
+    - https://www.youtube.com/results?search_query=...
+    """
+    if video_id_from_url(url):
+        return VIDEO
+    parsed = urlparse(url.strip())
+    if "youtube.com" not in parsed.netloc.lower():
+        return VIDEO
+    parts = parsed.path.strip("/").split("/")
+    query = parse_qs(parsed.query)
+    if parts[0] == "playlist" and "list" in query:
+        return PLAYLIST
+    if parts[0] == "results" and "search_query" in query:
+        return SEARCH
+    if parts[0].startswith("@") or (parts[0] in ("channel", "c", "user") and len(parts) >= 2):
+        return CHANNEL
+    return VIDEO
+
+
+def listing_url(url: str) -> str:
+    """
+    URL que se abre para expandir un listado: a un canal sin pestaña se le agrega "/videos".
+    """
+    url = url.strip()
+    if classify_url(url) != CHANNEL:
+        return url
+    parsed = urlparse(url)
+    parts = parsed.path.strip("/").split("/")
+    base = 1 if parts[0].startswith("@") else 2
+    if len(parts) > base and parts[base] in CHANNEL_TABS:
+        return url
+    return parsed._replace(path="/" + "/".join(parts[:base] + ["videos"]), query="").geturl()
+
+
+def channel_key(value: str) -> str | None:
+    """
+    Clave estable de un canal: "@handle", el ID "UC..." o "c/nombre" / "user/nombre".
+    Acepta la URL del canal (como `channel_id` en los resultados) o la clave misma.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if "youtube.com" not in value.lower():
+        return value
+    parsed = urlparse(value if "://" in value else f"https://{value}")
+    parts = [unquote(part) for part in parsed.path.strip("/").split("/")]
+    if parts[0].startswith("@"):
+        return parts[0]
+    if len(parts) >= 2 and parts[0] == "channel":
+        return parts[1]
+    if len(parts) >= 2 and parts[0] in ("c", "user"):
+        return f"{parts[0]}/{parts[1]}"
+    return value
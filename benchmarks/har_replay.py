@@ -0,0 +1,142 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Deterministic extraction benchmark over a recorded HAR corpus.
+
+Record the corpus once (live network). This also saves the comment count of every
+video as extracted while recording, in <corpus>/recorded_counts.json:
+    python benchmarks/har_replay.py -u corpus_urls.txt --corpus benchmarks/corpus --record
+
+Then replay it with no network access, several times:
+    python benchmarks/har_replay.py -u corpus_urls.txt --corpus benchmarks/corpus [--runs 3] [-c 10]
+
+Each run uses a fresh output directory and runs headless (the CLI default).
+The benchmark reports the wall time per run. It fails (exit status 1) when:
+- the CLI exits with an error, or any URL ends up in a failure_report_*.json
+  (the CLI exits 0 even when URLs fail);
+- a video extracts fewer comments in replay than in the recording, e.g. zero
+  because the comment continuation requests could not be served from the HAR;
+- two runs extract different counts, i.e. the extraction is not deterministic
+  over the same recorded pages.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "digibook.py")
+RECORDED_COUNTS = "recorded_counts.json"
+
+
+def run_cli(urls_file, corpus, max_concurrent, mode):
+    """
+    Runs the CLI once with --har-<mode> and returns
+    (elapsed seconds, exit status, {url: comments_length}, failed URLs).
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, CLI, "-u", urls_file, "-o", output_dir, "-c", str(max_concurrent),
+             f"--har-{mode}", corpus],
+            cwd=ROOT,
+        )
+        elapsed = time.perf_counter() - started
+
+        counts = {}
+        for path in glob.glob(os.path.join(output_dir, "**", "youtube_*.json"), recursive=True):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            counts[data["original_url"]] = data["post_comments"]["comments_length"]
+
+        failed_urls = []
+        for path in glob.glob(os.path.join(output_dir, "failure_report_*.json")):
+            with open(path, encoding="utf-8") as f:
+                failed_urls += [failure["url"] for failure in json.load(f)["failures"]]
+        return elapsed, proc.returncode, counts, failed_urls
+
+
+def truncated(recorded, counts):
+    """
+    URLs whose replay count is missing or below the recorded count.
+    """
+    def as_int(value):
+        return value if isinstance(value, int) else 0
+    return [url for url, expected in recorded.items() if as_int(counts.get(url)) < as_int(expected)]
+
+
+def record(args):
+    elapsed, status, counts, failed_urls = run_cli(args.urls_file, args.corpus, args.max_concurrent, "record")
+    os.makedirs(args.corpus, exist_ok=True)
+    with open(os.path.join(args.corpus, RECORDED_COUNTS), "w", encoding="utf-8") as f:
+        json.dump(counts, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"record: {elapsed:7.2f} s  videos={len(counts)}  status={status}  failed={len(failed_urls)}")
+    for url in failed_urls:
+        print(f"  failed: {url}")
+    return status == 0 and not failed_urls
+
+
+def replay(args):
+    path = os.path.join(args.corpus, RECORDED_COUNTS)
+    if not os.path.exists(path):
+        print(f"{path} not found: record the corpus with --record first.")
+        return False
+    with open(path, encoding="utf-8") as f:
+        recorded = json.load(f)
+
+    ok_all = True
+    baseline = None
+    for run in range(args.runs):
+        elapsed, status, counts, failed_urls = run_cli(args.urls_file, args.corpus, args.max_concurrent, "replay")
+        diffs = [] if baseline is None else [url for url in baseline if baseline[url] != counts.get(url)]
+        baseline = baseline if baseline is not None else counts
+        short = truncated(recorded, counts)
+        ok = status == 0 and not failed_urls and not diffs and not short
+        print(f"run {run+1}: {elapsed:7.2f} s  videos={len(counts)}  status={status}  failed={len(failed_urls)}  "
+              f"{'OK' if ok else f'FAIL ({len(diffs)} videos differ, {len(short)} below recording)'}")
+        for url in failed_urls:
+            print(f"  failed: {url}")
+        for url in short:
+            print(f"  below recording: {url} replay={counts.get(url)} recorded={recorded[url]}")
+        ok_all = ok_all and ok
+    return ok_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DigiBook HAR replay benchmark.")
+    parser.add_argument("-u", "--urls-file", required=True, help="URLs recorded in the corpus.")
+    parser.add_argument("--corpus", required=True, help="HAR directory (written with --record).")
+    parser.add_argument("--record", action="store_true",
+                        help="Record the corpus from the live network and save the reference counts.")
+    parser.add_argument("--runs", type=int, default=3, help="Replay runs. Default 3.")
+    parser.add_argument("-c", "--max-concurrent", type=int, default=10, help="Tabs per run. Default 10.")
+    args = parser.parse_args()
+
+    ok = record(args) if args.record else replay(args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+CPU benchmark for `--lean`: runs the CLI on the same URL list with and without
+lean rendering and reports CPU seconds per URL.
+
+CPU time is read from resource.getrusage(RUSAGE_CHILDREN) around each run, which
+includes the Playwright driver and every Chromium process it reaped.
+
+Usage:
+    python benchmarks/lean_cpu.py -u urls_input/youtube_urls.txt [-c 3] [--runs 1] [-- extra CLI args]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "digibook.py")
+
+
+def run_once(urls_file, max_concurrent, lean, extra):
+    """
+    Executes one CLI run and returns (cpu_seconds, wall_seconds).
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        command = [sys.executable, CLI, "-u", urls_file, "-c", str(max_concurrent),
+                   "-o", output_dir, "--order", "input", *extra]
+        if lean:
+            command.append("--lean")
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        started = time.monotonic()
+        subprocess.run(command, cwd=ROOT, check=False, stdout=subprocess.DEVNULL)
+        wall = time.monotonic() - started
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return cpu, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU seconds per URL with and without --lean.")
+    parser.add_argument("-u", "--urls-file", required=True, help="URL list used for both modes.")
+    parser.add_argument("-c", "--max-concurrent", type=int, default=3, help="Concurrent tabs. Default 3.")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per mode. Default 1.")
+    parser.add_argument("extra", nargs=argparse.REMAINDER, help="Extra CLI arguments after '--'.")
+    args = parser.parse_args()
+    extra = [a for a in args.extra if a != "--"]
+
+    with open(args.urls_file, "r") as f:
+        n_urls = sum(1 for line in f if line.strip())
+    if not n_urls:
+        sys.exit("URLs file empty.")
+
+    results = {}
+    for lean in (False, True):
+        cpu_total = wall_total = 0.0
+        for _ in range(args.runs):
+            cpu, wall = run_once(args.urls_file, args.max_concurrent, lean, extra)
+            cpu_total += cpu
+            wall_total += wall
+        results[lean] = cpu_total / (args.runs * n_urls)
+        label = "lean" if lean else "default"
+        print(f"{label:<8} cpu/url={results[lean]:7.2f} s  wall/run={wall_total / args.runs:7.1f} s  urls={n_urls}")
+
+    if results[False] > 0:
+        print(f"saving   {100 * (1 - results[True] / results[False]):.1f}% CPU per URL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+MediaStore benchmark against a local stand-in image server (no YouTube traffic).
+
+Serves `--images` distinct payloads under `--urls` different URLs (several URLs
+share the same bytes, like avatars at different sizes) and downloads every URL
+`--rounds` times through Playwright's pooled APIRequestContext. Reports
+downloads, cache hits, shared blobs and blobs on disk, and fails (exit status 1)
+when the store keeps more blobs than distinct payloads or re-downloads a cached URL.
+
+Usage:
+    python benchmarks/media_store.py [--urls 500] [--images 50] [--rounds 3] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from playwright.async_api import async_playwright
+from DigiMonitor.app.src.utils.media import BLOB_DIR, MediaStore
+
+
+def make_handler(images, requests):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            n = int(self.path.rsplit("/", 1)[-1])
+            body = images[n % len(images)]
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+async def bench(args, base, folder):
+    async with async_playwright() as p:
+        client = await p.request.new_context()
+        store = MediaStore(folder, max_concurrent=args.concurrency)
+        store.attach(client)
+        urls = [f"{base}/avatar/{n}" for n in range(args.urls)]
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            hashes = await store.fetch_all(urls)
+            timings.append(time.perf_counter() - started)
+        await client.dispose()
+        store.close()
+        return hashes, timings, store.status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaStore benchmark against a local stand-in server.")
+    parser.add_argument("--urls", type=int, default=500, help="Distinct URLs. Default 500.")
+    parser.add_argument("--images", type=int, default=50, help="Distinct payloads behind those URLs. Default 50.")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over all URLs. Default 3.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous downloads. Default 8.")
+    args = parser.parse_args()
+
+    images = [b"\x89PNG\r\n\x1a\n" + os.urandom(4096) for _ in range(args.images)]
+    requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(images, requests))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as folder:
+        hashes, timings, status = asyncio.run(bench(args, base, folder))
+        blobs = sum(len(files) for _, _, files in os.walk(os.path.join(folder, BLOB_DIR)))
+    server.shutdown()
+
+    for i, elapsed in enumerate(timings):
+        print(f"round {i+1}: {elapsed*1000:8.1f} ms for {args.urls} URLs")
+    print(f"server requests={len(requests)}  blobs={blobs}  status={status}")
+
+    failed = blobs != min(args.images, args.urls) or len(requests) != args.urls or None in hashes
+    print("FAIL" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# DIGIMONITOR is part of the DIGIBOOK collection.
+# DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
+# Repository: https://github.com/caminodelaserpiente/DigiBook
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Startup benchmark for the DigiBook CLI based on `python -X importtime`.
+
+Runs the fast paths (`--help`, `--version`, argument error) several times and
+fails (exit status 1) when:
+- a heavy module (Playwright, BeautifulSoup, pytz) is imported, or
+- the median cumulative import time exceeds the budget, or
+- the command leaves filesystem side effects (e.g. DigiMonitor/logs/scraper.log).
+
+Usage:
+    python benchmarks/startup_importtime.py [--runs 5] [--budget-ms 60]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "digibook.py")
+
+FORBIDDEN_MODULES = ("playwright", "bs4", "pytz")
+
+CASES = {
+    "help": ["--help"],
+    "version": ["--version"],
+    "argument-error": ["--max-concurrent", "0"],
+}
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(args, cwd):
+    """
+    Executes the CLI once with -X importtime and returns
+    (total top-level cumulative import time in ms, set of imported modules).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI, *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), match.group(3), match.group(4)
+        modules.add(module)
+        if len(indent) == 1:  # Top-level imports only, nested ones are already included
+            total_us += cumulative
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DigiBook CLI startup benchmark (-X importtime).")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case. Default 5.")
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="Maximum median cumulative import time per case in ms. Default 60.")
+    args = parser.parse_args()
+
+    failed = False
+    log_file = os.path.join(ROOT, "DigiMonitor", "logs", "scraper.log")
+    log_existed = os.path.exists(log_file)
+
+    for name, cli_args in CASES.items():
+        timings = []
+        imported = set()
+        for _ in range(args.runs):
+            elapsed_ms, modules = measure(cli_args, ROOT)
+            timings.append(elapsed_ms)
+            imported |= modules
+
+        median = statistics.median(timings)
+        heavy = sorted(m for m in imported if m.split(".")[0] in FORBIDDEN_MODULES)
+        status = "OK"
+        if heavy:
+            status = f"FAIL heavy imports: {', '.join(heavy[:5])}"
+            failed = True
+        elif median > args.budget_ms:
+            status = f"FAIL over budget ({args.budget_ms:.0f} ms)"
+            failed = True
+        print(f"{name:<16} median={median:7.2f} ms  min={min(timings):7.2f} ms  modules={len(imported):4d}  {status}")
+
+    if not log_existed and os.path.exists(log_file):
+        print(f"FAIL side effect: {log_file} created by a fast path")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,15 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from DigiMonitor.app.src.scraper.youtube import YTScraper
+# Only lightweight modules at load time: Playwright, BeautifulSoup and pytz are
+# imported inside main() once scraping actually starts (see benchmarks/startup_importtime.py).
+from DigiMonitor.app.src.utils import logger
 import argparse
+import json
 import logging
 import os
 import sys
+from datetime import datetime
 
 
 VERSION_INFO = """DIGIBOOK Copyright (C) 2024-2025 Daniel A. L.
@@ -32,12 +36,6 @@ Redistribution of this software is
 covered by the terms of the DIGIBOOK LICENSE."""
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
 def main():
     """
     Main function for CLI configuration and execution.
@@ -54,6 +52,7 @@ def main():
         epilog="""
         Usage examples:
         python digimonitor.py -u urls_input/youtube_urls.txt --max-concurrent 10 --headless
+        python digibook.py --daemon --port 8765 --max-concurrent 5
         """
     )
 
@@ -62,8 +61,7 @@ def main():
     parser.add_argument(
         '-u', '--urls-file',
         type=str,
-        required=True,
-        help='Path, file, YouTube URLs list (one per line).'
+        help='Path, file, YouTube video, channel, playlist or search URLs list (one per line). Required unless --daemon.'
     )
 
     parser.add_argument(
@@ -86,6 +84,341 @@ def main():
         help="Directory, storage, data output. Default 'out_storage'."
     )
 
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Mode, long-running daemon, warm browser, local HTTP job API.'
+    )
+
+    parser.add_argument(
+        '--host',
+        type=str,
+        default="127.0.0.1",
+        help="Address, daemon, HTTP listening. Default '127.0.0.1'."
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port, daemon, HTTP listening. Default 8765.'
+    )
+
+    parser.add_argument(
+        '--socket',
+        type=str,
+        default=None,
+        help='Path, daemon, Unix socket listening (instead of TCP).'
+    )
+
+    parser.add_argument(
+        '--user-data-dir',
+        type=str,
+        default=None,
+        help='Directory, browser, persistent profile with disk HTTP cache (locked per process).'
+    )
+
+    parser.add_argument(
+        '--cache-size-mb',
+        type=int,
+        default=512,
+        help='Size, persistent profile, disk cache limit in MB. Default 512.'
+    )
+
+    parser.add_argument(
+        '--profile-lock-timeout',
+        type=float,
+        default=0,
+        help='Seconds, max wait for a persistent profile locked by another process (0 = wait indefinitely). Default 0.'
+    )
+
+    parser.add_argument(
+        '--prewarm-url',
+        action='append',
+        default=[],
+        help='URL, visited before scraping to pre-warm the browser cache (repeatable).'
+    )
+
+    parser.add_argument(
+        '--traffic-stats',
+        action='store_true',
+        help='Report, network and cached bytes per URL and per run.'
+    )
+
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=3,
+        help='Number, retries per URL for transient/throttled failures. Default 3.'
+    )
+
+    parser.add_argument(
+        '--navigate-timeout',
+        type=float,
+        default=30.0,
+        help='Seconds, page navigation timeout. Default 30.'
+    )
+
+    parser.add_argument(
+        '--ready-timeout',
+        type=float,
+        default=20.0,
+        help='Seconds, wait for the video page to be ready. Default 20.'
+    )
+
+    parser.add_argument(
+        '--url-deadline',
+        type=float,
+        default=0.0,
+        help='Seconds, watchdog wall-clock limit per URL; a URL over it is closed and not retried. 0 = off. Default off.'
+    )
+
+    parser.add_argument(
+        '--stall-deadline',
+        type=float,
+        default=300.0,
+        help='Seconds, watchdog limit without progress while scrolling, extracting or expanding replies. 0 = off. Default 300.'
+    )
+
+    parser.add_argument(
+        '--phase-deadline',
+        action='append',
+        metavar='PHASE=SECONDS',
+        default=[],
+        help='Watchdog, wall-clock limit of one phase (navigate, ready, sort, scroll, extract, replies, metadata, channel). 0 = off. Repeatable.'
+    )
+
+    parser.add_argument(
+        '--nav-rate',
+        type=float,
+        default=1.0,
+        help='Rate, page navigations per second across all tabs, adapts down on throttling. 0 = unlimited. Default 1.'
+    )
+
+    parser.add_argument(
+        '--scroll-rate',
+        type=float,
+        default=5.0,
+        help='Rate, comment-loading scroll iterations per second across all tabs. 0 = unlimited. Default 5.'
+    )
+
+    parser.add_argument(
+        '--order',
+        choices=["longest-first", "input"],
+        default="longest-first",
+        help="Order, URL processing: longest expected first (from previous runs) or input order. Default 'longest-first'."
+    )
+
+    parser.add_argument(
+        '--max-comments',
+        type=int,
+        default=None,
+        help='Budget, maximum comments per URL. Default all.'
+    )
+
+    parser.add_argument(
+        '--scroll-timeout',
+        type=float,
+        default=None,
+        help='Budget, maximum seconds of comment scrolling per URL. Default unlimited.'
+    )
+
+    parser.add_argument(
+        '--max-scroll-iterations',
+        type=int,
+        default=None,
+        help='Budget, maximum comment scroll iterations per URL. Default unlimited.'
+    )
+
+    parser.add_argument(
+        '--comment-sort',
+        choices=["top", "newest"],
+        default="top",
+        help="Order, comments: 'top' or 'newest'. Default 'top'."
+    )
+
+    parser.add_argument(
+        '--replies',
+        action='store_true',
+        help='Mode, expand and extract comment reply threads.'
+    )
+
+    parser.add_argument(
+        '--reply-concurrency',
+        type=int,
+        default=4,
+        help='Number, reply threads loading at once inside a page. Default 4.'
+    )
+
+    parser.add_argument(
+        '--max-replies-per-thread',
+        type=int,
+        default=None,
+        help='Budget, maximum replies per comment thread. Default all.'
+    )
+
+    parser.add_argument(
+        '--max-replies-per-video',
+        type=int,
+        default=None,
+        help='Budget, maximum replies per video. Default all.'
+    )
+
+    parser.add_argument(
+        '--dedupe-index',
+        type=str,
+        default=None,
+        help='Directory, persistent cross-run comment dedupe index (Bloom filter + SQLite). Writes each comment once.'
+    )
+
+    parser.add_argument(
+        '--dedupe-capacity',
+        type=int,
+        default=10_000_000,
+        help='Number, expected comments in the dedupe index, sizes its Bloom filter (~1.2 bytes each). Default 10000000.'
+    )
+
+    parser.add_argument(
+        '--max-videos-per-listing',
+        type=int,
+        default=None,
+        help='Budget, videos discovered per channel, playlist or search URL in the URLs file. Default all.'
+    )
+
+    parser.add_argument(
+        '--media-dir',
+        type=str,
+        default=None,
+        help='Directory, content-addressed store for thumbnails and avatars; records get their sha256. Default off.'
+    )
+
+    parser.add_argument(
+        '--media-concurrency',
+        type=int,
+        default=8,
+        help='Number, simultaneous media downloads. Default 8.'
+    )
+
+    parser.add_argument(
+        '--har-record',
+        type=str,
+        metavar='DIR',
+        default=None,
+        help='Directory, record each URL\'s network traffic as a HAR archive (written when the browser closes).'
+    )
+
+    parser.add_argument(
+        '--har-replay',
+        type=str,
+        metavar='DIR',
+        default=None,
+        help='Directory, replay recorded HAR archives with no network access (offline re-extraction, benchmarks).'
+    )
+
+    parser.add_argument(
+        '--layout',
+        choices=["flat", "sharded"],
+        default="flat",
+        help="Layout, output files: 'flat' or hash-'sharded' subdirectories per video ID. Default 'flat'."
+    )
+
+    parser.add_argument(
+        '--lookup',
+        type=str,
+        metavar='VIDEO_ID',
+        default=None,
+        help='Catalog, print the latest output location of a video and exit.'
+    )
+
+    parser.add_argument(
+        '--compact-older-than',
+        type=float,
+        metavar='DAYS',
+        default=None,
+        help='Catalog, pack output files older than DAYS into monthly ZIP archives and exit.'
+    )
+
+    parser.add_argument(
+        '--export-series',
+        type=str,
+        metavar='ID',
+        default=None,
+        help='Time series, print the counter snapshots of a video ID or channel (@handle, UC... ID or URL, as scraped) as CSV and exit.'
+    )
+
+    parser.add_argument(
+        '--since',
+        type=str,
+        default=None,
+        help="Date, first snapshot exported by --export-series ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS')."
+    )
+
+    parser.add_argument(
+        '--until',
+        type=str,
+        default=None,
+        help="Date, last snapshot exported by --export-series ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS')."
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Mode, event-loop stall monitor and stack sampling (flame-graph '.folded' file in <output-dir>/profiles)."
+    )
+
+    parser.add_argument(
+        '--stall-threshold',
+        type=float,
+        default=0.1,
+        help='Seconds, event-loop stall reporting threshold for --profile. Default 0.1.'
+    )
+
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help="Mode, with --profile, also save cProfile stats ('.prof')."
+    )
+
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Mode, lean rendering: small viewport, no animations, paused player, no sidebar. Less CPU per tab.'
+    )
+
+    parser.add_argument(
+        '--max-concurrent-channels',
+        type=int,
+        default=2,
+        help='Number, concurrent tabs for the channel stage (each channel fetched once per run). Default 2.'
+    )
+
+    parser.add_argument(
+        '--live-chat',
+        action='store_true',
+        help='Mode, continuous live-chat monitoring of the URLs (NDJSON per stream in the output directory).'
+    )
+
+    parser.add_argument(
+        '--live-duration',
+        type=float,
+        default=None,
+        help='Seconds, live-chat monitoring per stream, counted from when the stream gets its tab. Default until Ctrl+C.'
+    )
+
+    parser.add_argument(
+        '--live-poll-interval',
+        type=float,
+        default=2.0,
+        help='Seconds, between live-chat buffer drains. Default 2.'
+    )
+
+    parser.add_argument(
+        '--live-keep-dom',
+        type=int,
+        default=200,
+        help='Number, chat messages kept in the page DOM (older ones are pruned). Default 200.'
+    )
+
     parser.add_argument(
         '--version', 
         action='store_true', 
@@ -96,15 +429,188 @@ def main():
     args = parser.parse_args()
 
     # 4. Validation
-    if not args.max_concurrent > 0:
-        logging.error("Argument error: --max-concurrent must be greater than zero.")
+    if not args.max_concurrent > 0 or not args.max_concurrent_channels > 0:
+        logging.error("Argument error: --max-concurrent and --max-concurrent-channels must be greater than zero.")
+        parser.exit(status=1)
+
+    if not args.cache_size_mb > 0:
+        logging.error("Argument error: --cache-size-mb must be greater than zero.")
+        parser.exit(status=1)
+
+    if args.max_retries < 0 or not args.navigate_timeout > 0 or not args.ready_timeout > 0:
+        logging.error("Argument error: --max-retries must be >= 0 and timeouts greater than zero.")
+        parser.exit(status=1)
+
+    if args.nav_rate < 0 or args.scroll_rate < 0:
+        logging.error("Argument error: --nav-rate and --scroll-rate must be >= 0.")
+        parser.exit(status=1)
+
+    budgets = (args.max_comments, args.scroll_timeout, args.max_scroll_iterations,
+               args.reply_concurrency, args.max_replies_per_thread, args.max_replies_per_video)
+    if any(budget is not None and not budget > 0 for budget in budgets):
+        logging.error("Argument error: comment and reply budgets and --reply-concurrency must be greater than zero.")
+        parser.exit(status=1)
+
+    if not args.dedupe_capacity > 0:
+        logging.error("Argument error: --dedupe-capacity must be greater than zero.")
+        parser.exit(status=1)
+
+    if args.max_videos_per_listing is not None and not args.max_videos_per_listing > 0:
+        logging.error("Argument error: --max-videos-per-listing must be greater than zero.")
         parser.exit(status=1)
 
-    # 5. Output directory creation
+    if not args.media_concurrency > 0:
+        logging.error("Argument error: --media-concurrency must be greater than zero.")
+        parser.exit(status=1)
+
+    phase_deadlines = {}
+    if args.phase_deadline:
+        from DigiMonitor.app.src.scheduler.watchdog import PHASE_DEADLINES
+        for item in args.phase_deadline:
+            phase, _, seconds = item.partition("=")
+            try:
+                phase_deadlines[phase] = float(seconds) or None
+            except ValueError:
+                phase = None
+            if phase not in PHASE_DEADLINES or (phase_deadlines[phase] or 0) < 0:
+                logging.error(f"Argument error: invalid --phase-deadline '{item}' (expected PHASE=SECONDS, "
+                              f"PHASE in {', '.join(PHASE_DEADLINES)}).")
+                parser.exit(status=1)
+
+    if args.url_deadline < 0 or args.stall_deadline < 0:
+        logging.error("Argument error: --url-deadline and --stall-deadline must be >= 0.")
+        parser.exit(status=1)
+
+    if args.har_record and args.har_replay:
+        logging.error("Argument error: --har-record and --har-replay are mutually exclusive.")
+        parser.exit(status=1)
+
+    if args.har_replay and args.media_dir:
+        logging.error("Argument error: --media-dir downloads from the network and cannot be used with --har-replay.")
+        parser.exit(status=1)
+
+    live_options = (args.live_duration, args.live_poll_interval, args.live_keep_dom)
+    if any(option is not None and not option > 0 for option in live_options):
+        logging.error("Argument error: --live-duration, --live-poll-interval and --live-keep-dom must be greater than zero.")
+        parser.exit(status=1)
+
+    if not args.stall_threshold > 0:
+        logging.error("Argument error: --stall-threshold must be greater than zero.")
+        parser.exit(status=1)
+
+    if args.compact_older_than is not None and args.compact_older_than < 0:
+        logging.error("Argument error: --compact-older-than must be >= 0.")
+        parser.exit(status=1)
+
+    if args.profile_lock_timeout < 0:
+        logging.error("Argument error: --profile-lock-timeout must be >= 0.")
+        parser.exit(status=1)
+
+    range_bounds = []
+    for bound, end_of_day in ((args.since, False), (args.until, True)):
+        if bound is None:
+            range_bounds.append(None)
+            continue
+        try:
+            date = datetime.strptime(bound, "%Y-%m-%d %H:%M:%S" if " " in bound else "%Y-%m-%d")
+        except ValueError:
+            logging.error(f"Argument error: invalid date '{bound}' (expected 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS').")
+            parser.exit(status=1)
+        if end_of_day and " " not in bound:
+            date = date.replace(hour=23, minute=59, second=59)
+        range_bounds.append(date.timestamp())
+
+    catalog_mode = args.lookup is not None or args.compact_older_than is not None or args.export_series is not None
+    if not args.daemon and not catalog_mode and not args.urls_file:
+        parser.error("the following arguments are required: -u/--urls-file (or use --daemon)")
+
+    # 5. Logging and output directory creation
+    logger.setup()
     os.makedirs(args.output_dir, exist_ok=True)
     logging.info(f"Output directory: {args.output_dir}")
 
-    # 6. Logic execution
+    # Catalog commands (SQLite only, no browser)
+    if catalog_mode:
+        from DigiMonitor.app.src.utils.catalog import Catalog
+        catalog = Catalog(args.output_dir)
+        try:
+            if args.lookup is not None:
+                entry = catalog.latest(args.lookup)
+                if entry is None:
+                    parser.exit(status=1, message=f"Video '{args.lookup}' not found in catalog.\n")
+                print(json.dumps(entry, ensure_ascii=False, indent=4))
+            if args.compact_older_than is not None:
+                compacted = catalog.compact(args.compact_older_than)
+                print(f"Compacted files: {compacted}")
+            if args.export_series is not None:
+                import csv
+                from DigiMonitor.app.src.utils.timeseries import COLUMNS, SeriesStore
+                series = SeriesStore(args.output_dir)
+                kind, rows = "video", series.query("video", args.export_series, *range_bounds)
+                if not rows:
+                    kind, rows = "channel", series.query("channel", args.export_series, *range_bounds)
+                if not rows:
+                    parser.exit(status=1, message=f"No time-series snapshots for '{args.export_series}'.\n")
+                writer = csv.DictWriter(sys.stdout, fieldnames=["timestamp", "date", *COLUMNS[kind]])
+                writer.writeheader()
+                writer.writerows(rows)
+        finally:
+            catalog.close()
+        return
+
+    scraper_options = {
+        "output_dir": args.output_dir,
+        "headless": args.headless,
+        "user_data_dir": args.user_data_dir,
+        "cache_size_mb": args.cache_size_mb,
+        "profile_lock_timeout": args.profile_lock_timeout or None,
+        "prewarm_urls": args.prewarm_url,
+        "traffic_stats": args.traffic_stats,
+        "max_retries": args.max_retries,
+        "timeouts": {"navigate": args.navigate_timeout, "ready": args.ready_timeout},
+        "nav_rate": args.nav_rate,
+        "scroll_rate": args.scroll_rate,
+        "order": args.order,
+        "max_comments": args.max_comments,
+        "scroll_timeout": args.scroll_timeout,
+        "max_scroll_iterations": args.max_scroll_iterations,
+        "comment_sort": args.comment_sort,
+        "replies": args.replies,
+        "reply_concurrency": args.reply_concurrency,
+        "max_replies_per_thread": args.max_replies_per_thread,
+        "max_replies_per_video": args.max_replies_per_video,
+        "dedupe_dir": args.dedupe_index,
+        "dedupe_capacity": args.dedupe_capacity,
+        "layout": args.layout,
+        "profile": args.profile,
+        "stall_threshold": args.stall_threshold,
+        "cprofile": args.cprofile,
+        "lean": args.lean,
+        "max_concurrent_channels": args.max_concurrent_channels,
+        "media_dir": args.media_dir,
+        "media_concurrency": args.media_concurrency,
+        "max_videos_per_listing": args.max_videos_per_listing,
+        "har_dir": args.har_record or args.har_replay,
+        "har_mode": "record" if args.har_record else "replay" if args.har_replay else None,
+        "url_deadline": args.url_deadline or None,
+        "phase_deadlines": phase_deadlines,
+        "stall_deadline": args.stall_deadline or None,
+    }
+
+    # 6. Logic execution (heavy imports happen here, not at module load)
+    if args.daemon:
+        from DigiMonitor.app.src.driver.browser_manager import ProfileLocked
+        from DigiMonitor.app.src.scraper.youtube import YTScraper
+        from DigiMonitor.app.src.service.daemon import ScraperDaemon
+
+        scraper = YTScraper([], args.max_concurrent, **scraper_options)
+        try:
+            ScraperDaemon(scraper, host=args.host, port=args.port, socket_path=args.socket).run()
+        except ProfileLocked as error:
+            logging.error(f"Error: {error}. Use another --user-data-dir or raise --profile-lock-timeout.")
+            parser.exit(status=1)
+        return
+
     try:
         logging.info(f"Reading URLs file: {args.urls_file}")
         with open(args.urls_file, "r") as f:
@@ -114,8 +620,25 @@ def main():
             logging.warning("URLs file empty. No data for processing.")
             return
 
-        scraper = YTScraper(urls, args.max_concurrent, output_dir=args.output_dir, headless=args.headless)
-        scraper.run()
+        from DigiMonitor.app.src.driver.browser_manager import ProfileLocked
+        from DigiMonitor.app.src.scraper.youtube import YTScraper
+        scraper = YTScraper(urls, args.max_concurrent, **scraper_options)
+
+        try:
+            if args.live_chat:
+                from DigiMonitor.app.src.scraper.live_chat import LiveChatMonitor
+                LiveChatMonitor(
+                    scraper,
+                    duration=args.live_duration,
+                    poll_interval=args.live_poll_interval,
+                    keep_dom=args.live_keep_dom
+                ).run()
+                return
+
+            scraper.run()
+        except ProfileLocked as error:
+            logging.error(f"Error: {error}. Use another --user-data-dir or raise --profile-lock-timeout.")
+            parser.exit(status=1)
 
     except FileNotFoundError:
         logging.error(f"Error: File not found '{args.urls_file}'. Verify path.")